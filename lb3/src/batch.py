@@ -0,0 +1,89 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from main import DISTANCE_EXCEEDED
+
+_worker_targets: Tuple[Sequence[str], List[int], int, int, int, Optional[int]] = ((), [], 0, 0, 0, None)
+
+def _common_prefix_length(a: str, b: str) -> int:
+    limit: int = min(len(a), len(b))
+    k: int = 0
+    while k < limit and a[k] == b[k]:
+        k += 1
+    return k
+
+def _next_column(s: str, prev: List[int], c: str, depth: int, w_ins: int, w_del: int, w_sub: int) -> List[int]:
+    cur: List[int] = [depth * w_ins] * (len(s) + 1)
+    for i in range(1, len(s) + 1):
+        if s[i-1] == c:
+            cur[i] = prev[i-1]
+        else:
+            cur[i] = min(prev[i] + w_ins, cur[i-1] + w_del, prev[i-1] + w_sub)
+    return cur
+
+def sorted_order(targets: Sequence[str]) -> List[int]:
+    return sorted(range(len(targets)), key=targets.__getitem__)
+
+def one_to_many_levenshtein(source: str, targets: Sequence[str], w_ins: int, w_del: int, w_sub: int,
+                            max_distance: Optional[int] = None, order: Optional[Sequence[int]] = None) -> np.ndarray:
+    m: int = len(source)
+    distances: np.ndarray = np.full(len(targets), DISTANCE_EXCEEDED, dtype=np.int64)
+    columns: List[List[int]] = [[i * w_del for i in range(m + 1)]]
+    dead_depth: Optional[int] = None
+    previous: str = ''
+
+    for index in order if order is not None else sorted_order(targets):
+        target: str = targets[index]
+        shared: int = _common_prefix_length(previous, target)
+        del columns[shared + 1:]
+        previous = target
+
+        if dead_depth is not None and dead_depth <= shared:
+            continue
+        dead_depth = None
+
+        for depth in range(shared + 1, len(target) + 1):
+            column: List[int] = _next_column(source, columns[-1], target[depth - 1], depth, w_ins, w_del, w_sub)
+            columns.append(column)
+            if max_distance is not None and min(column) > max_distance:
+                dead_depth = depth
+                break
+
+        if dead_depth is not None:
+            continue
+        distance: int = columns[len(target)][m]
+        if max_distance is None or distance <= max_distance:
+            distances[index] = distance
+
+    return distances
+
+def _init_worker(targets: Sequence[str], order: List[int], w_ins: int, w_del: int, w_sub: int,
+                 max_distance: Optional[int]) -> None:
+    global _worker_targets
+    _worker_targets = (targets, order, w_ins, w_del, w_sub, max_distance)
+
+def _worker_row(source: str) -> np.ndarray:
+    targets, order, w_ins, w_del, w_sub, max_distance = _worker_targets
+    return one_to_many_levenshtein(source, targets, w_ins, w_del, w_sub, max_distance, order)
+
+def many_to_many_levenshtein(sources: Sequence[str], targets: Sequence[str], w_ins: int, w_del: int, w_sub: int,
+                             max_distance: Optional[int] = None, processes: Optional[int] = None) -> np.ndarray:
+    matrix: np.ndarray = np.full((len(sources), len(targets)), DISTANCE_EXCEEDED, dtype=np.int64)
+    targets = list(targets)
+    order: List[int] = sorted_order(targets)
+
+    if processes == 1 or len(sources) < 2:
+        for row, source in enumerate(sources):
+            matrix[row] = one_to_many_levenshtein(source, targets, w_ins, w_del, w_sub, max_distance, order)
+        return matrix
+
+    workers: int = processes or os.cpu_count() or 1
+    chunksize: int = max(1, len(sources) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(targets, order, w_ins, w_del, w_sub, max_distance)) as pool:
+        for row, distances in enumerate(pool.map(_worker_row, sources, chunksize=chunksize)):
+            matrix[row] = distances
+    return matrix
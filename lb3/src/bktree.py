@@ -0,0 +1,134 @@
+import heapq
+import json
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from main import DISTANCE_EXCEEDED, banded_levenshtein_distance, classic_levenshtein_value
+
+QueryResult = namedtuple('QueryResult', ['matches', 'evaluations'])
+
+class BKTree:
+    def __init__(self, w_ins: int, w_del: int, w_sub: int) -> None:
+        if w_ins != w_del:
+            raise ValueError("BK-дерево требует симметричных весов: цена вставки должна совпадать с ценой удаления")
+        self._w_ins: int = w_ins
+        self._w_del: int = w_del
+        self._w_sub: int = w_sub
+        self._words: List[str] = []
+        self._children: List[Dict[int, int]] = []
+
+    @property
+    def weights(self) -> Tuple[int, int, int]:
+        return self._w_ins, self._w_del, self._w_sub
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def _distance(self, s: str, t: str, bound: Optional[int] = None) -> int:
+        if bound is None:
+            return classic_levenshtein_value(s, t, self._w_ins, self._w_del, self._w_sub)
+        return banded_levenshtein_distance(s, t, self._w_ins, self._w_del, self._w_sub, bound, with_operations=False)[0]
+
+    def add(self, word: str) -> None:
+        if not self._words:
+            self._words.append(word)
+            self._children.append({})
+            return
+
+        node: int = 0
+        while True:
+            distance: int = self._distance(word, self._words[node])
+            if distance == 0:
+                return
+            child: Optional[int] = self._children[node].get(distance)
+            if child is None:
+                self._words.append(word)
+                self._children.append({})
+                self._children[node][distance] = len(self._words) - 1
+                return
+            node = child
+
+    def extend(self, words: Iterable[str]) -> None:
+        for word in words:
+            self.add(word)
+
+    def _probe(self, query: str, node: int, radius: float) -> int:
+        children: Dict[int, int] = self._children[node]
+        if radius == float('inf'):
+            return self._distance(query, self._words[node])
+        bound: int = int(radius) + max(children, default=0)
+        return self._distance(query, self._words[node], bound)
+
+    def search(self, query: str, radius: int) -> QueryResult:
+        matches: List[Tuple[int, str]] = []
+        evaluations: int = 0
+        if not self._words:
+            return QueryResult(matches, evaluations)
+
+        stack: List[int] = [0]
+        while stack:
+            node: int = stack.pop()
+            distance: int = self._probe(query, node, radius)
+            evaluations += 1
+            if distance == DISTANCE_EXCEEDED:
+                continue
+            if distance <= radius:
+                matches.append((distance, self._words[node]))
+            for edge, child in self._children[node].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+
+        matches.sort()
+        return QueryResult(matches, evaluations)
+
+    def nearest(self, query: str, k: int = 1) -> QueryResult:
+        best: List[Tuple[int, str]] = []
+        evaluations: int = 0
+        if not self._words or k <= 0:
+            return QueryResult([], evaluations)
+
+        frontier: List[Tuple[int, int]] = [(0, 0)]
+        while frontier:
+            lower_bound, node = heapq.heappop(frontier)
+            radius: float = -best[0][0] if len(best) == k else float('inf')
+            if lower_bound > radius:
+                break
+
+            distance: int = self._probe(query, node, radius)
+            evaluations += 1
+            if distance == DISTANCE_EXCEEDED:
+                continue
+            if distance < radius or len(best) < k:
+                heapq.heappush(best, (-distance, self._words[node]))
+                if len(best) > k:
+                    heapq.heappop(best)
+                radius = -best[0][0] if len(best) == k else float('inf')
+
+            for edge, child in self._children[node].items():
+                child_bound: int = abs(distance - edge)
+                if child_bound <= radius:
+                    heapq.heappush(frontier, (child_bound, child))
+
+        return QueryResult(sorted((-d, w) for d, w in best), evaluations)
+
+    def save(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'weights': list(self.weights),
+                'words': self._words,
+                'children': [{str(d): c for d, c in children.items()} for children in self._children],
+            }, f, ensure_ascii=False)
+
+    @staticmethod
+    def load(path: str) -> 'BKTree':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        tree = BKTree(*data['weights'])
+        tree._words = data['words']
+        tree._children = [{int(d): c for d, c in children.items()} for children in data['children']]
+        return tree
+
+def build_bktree(words: Iterable[str], w_ins: int, w_del: int, w_sub: int) -> BKTree:
+    tree = BKTree(w_ins, w_del, w_sub)
+    tree.extend(words)
+    return tree
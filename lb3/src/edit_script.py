@@ -0,0 +1,76 @@
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+OP_MATCH: int = 0
+OP_INSERT: int = 1
+OP_DELETE: int = 2
+OP_REPLACE: int = 3
+OP_SYMBOLS: str = 'MIDR'
+
+class PackedOperations:
+    def __init__(self, m: int, n: int) -> None:
+        self._m: int = m
+        self._n: int = n
+        self._stride: int = (n + 4) // 4
+        self._data: np.ndarray = np.zeros((m + 1, self._stride), dtype=np.uint8)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self._m + 1, self._n + 1
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def set_row(self, i: int, codes: np.ndarray) -> None:
+        padded: np.ndarray = np.zeros(self._stride * 4, dtype=np.uint8)
+        padded[:len(codes)] = codes
+        quads: np.ndarray = padded.reshape(-1, 4)
+        self._data[i] = quads[:, 0] | (quads[:, 1] << 2) | (quads[:, 2] << 4) | (quads[:, 3] << 6)
+
+    def __getitem__(self, cell: Tuple[int, int]) -> int:
+        i, j = cell
+        return (int(self._data[i, j >> 2]) >> ((j & 3) << 1)) & 3
+
+def trace_steps(ops: PackedOperations, m: int, n: int) -> Tuple[bytearray, int]:
+    steps: bytearray = bytearray((m + n + 3) // 4)
+    count: int = 0
+    i, j = m, n
+    while i > 0 or j > 0:
+        op: int = ops[i, j] if i > 0 and j > 0 else (OP_INSERT if i == 0 else OP_DELETE)
+        steps[count >> 2] |= op << ((count & 3) << 1)
+        count += 1
+        if op == OP_MATCH or op == OP_REPLACE:
+            i -= 1
+            j -= 1
+        elif op == OP_INSERT:
+            j -= 1
+        else:
+            i -= 1
+    return steps, count
+
+def iter_edit_runs(ops: PackedOperations, m: int, n: int) -> Iterator[Tuple[str, int]]:
+    steps, count = trace_steps(ops, m, n)
+    current: int = -1
+    run: int = 0
+    for k in range(count - 1, -1, -1):
+        op: int = (steps[k >> 2] >> ((k & 3) << 1)) & 3
+        if op == current:
+            run += 1
+            continue
+        if run:
+            yield OP_SYMBOLS[current], run
+        current = op
+        run = 1
+    if run:
+        yield OP_SYMBOLS[current], run
+
+def expand_runs(runs: Iterable[Tuple[str, int]]) -> List[str]:
+    operations: List[str] = []
+    for op, run in runs:
+        operations.extend(op * run)
+    return operations
+
+def format_runs(runs: Iterable[Tuple[str, int]]) -> str:
+    return ', '.join(op if run == 1 else f"{op}×{run}" for op, run in runs)
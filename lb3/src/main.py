@@ -1,8 +1,29 @@
-from typing import List, Set, Tuple
+from typing import List, Optional, Set, Tuple
 
 DEBUG: bool = True
+HIRSCHBERG_BASE_CELLS: int = 4096
+DISTANCE_EXCEEDED: int = -1
 
-def classic_levenshtein_distance(s: str, t: str, w_ins: int, w_del: int, w_sub: int) -> Tuple[int, List[str]]:
+def traceback_operations(ops: List[List[str]], m: int, n: int) -> List[str]:
+    operations: List[str] = []
+    i, j = m, n
+    while i > 0 or j > 0:
+        if ops[i][j] == 'M' or ops[i][j] == 'R':
+            operations.append(ops[i][j])
+            i -= 1
+            j -= 1
+        elif ops[i][j] == 'I':
+            operations.append('I')
+            j -= 1
+        elif ops[i][j] == 'D':
+            operations.append('D')
+            i -= 1
+
+    operations.reverse()
+    return operations
+
+def levenshtein_tables(s: str, t: str, w_ins: int, w_del: int, w_sub: int,
+                       debug: bool = False) -> Tuple[List[List[int]], List[List[str]]]:
     m: int = len(s)
     n: int = len(t)
 
@@ -16,7 +37,7 @@ def classic_levenshtein_distance(s: str, t: str, w_ins: int, w_del: int, w_sub:
         dp[0][j] = j * w_ins
         ops[0][j] = 'I' if j > 0 else ''
 
-    if DEBUG:
+    if debug:
         print(f"Начальная таблица DP (классический алгоритм):")
         for row in dp:
             print(row)
@@ -26,7 +47,7 @@ def classic_levenshtein_distance(s: str, t: str, w_ins: int, w_del: int, w_sub:
             if s[i-1] == t[j-1]:
                 dp[i][j] = dp[i-1][j-1]
                 ops[i][j] = 'M'
-                if DEBUG:
+                if debug:
                     print(f"Совпадение на s[{i-1}]={s[i-1]}, t[{j-1}]={t[j-1]}: dp[{i}][{j}] = {dp[i][j]}, op=M")
             else:
                 insert_cost: int = dp[i][j-1] + w_ins
@@ -41,11 +62,24 @@ def classic_levenshtein_distance(s: str, t: str, w_ins: int, w_del: int, w_sub:
                 else:
                     ops[i][j] = 'R'
 
-                if DEBUG:
+                if debug:
                     print(f"Нет совпадения на s[{i-1}]={s[i-1]}, t[{j-1}]={t[j-1]}: "
                           f"Выбрана {ops[i][j]}, dp[{i}][{j}] = {dp[i][j]} "
                           f"(вставка={insert_cost}, удаление={delete_cost}, замена={substitute_cost})")
 
+    return dp, ops
+
+def classic_levenshtein_distance(s: str, t: str, w_ins: int, w_del: int, w_sub: int, linear_space: bool = False,
+                                 max_distance: Optional[int] = None) -> Tuple[int, List[str]]:
+    if max_distance is not None:
+        return banded_levenshtein_distance(s, t, w_ins, w_del, w_sub, max_distance)
+    if linear_space:
+        return hirschberg_levenshtein_distance(s, t, w_ins, w_del, w_sub)
+
+    m: int = len(s)
+    n: int = len(t)
+    dp, ops = levenshtein_tables(s, t, w_ins, w_del, w_sub, DEBUG)
+
     if DEBUG:
         print("\nФинальная таблица DP (классический алгоритм):")
         for row in dp:
@@ -54,22 +88,70 @@ def classic_levenshtein_distance(s: str, t: str, w_ins: int, w_del: int, w_sub:
         for row in ops:
             print(row)
 
+    operations: List[str] = traceback_operations(ops, m, n)
+    return dp[m][n], operations
+
+def levenshtein_last_row(s: str, t: str, w_ins: int, w_del: int, w_sub: int) -> List[int]:
+    n: int = len(t)
+    prev: List[int] = [j * w_ins for j in range(n + 1)]
+    cur: List[int] = [0] * (n + 1)
+
+    for i in range(1, len(s) + 1):
+        a: str = s[i-1]
+        cur[0] = i * w_del
+        for j in range(1, n + 1):
+            if a == t[j-1]:
+                cur[j] = prev[j-1]
+            else:
+                cur[j] = min(cur[j-1] + w_ins, prev[j] + w_del, prev[j-1] + w_sub)
+        prev, cur = cur, prev
+
+    return prev
+
+def classic_levenshtein_value(s: str, t: str, w_ins: int, w_del: int, w_sub: int) -> int:
+    return levenshtein_last_row(s, t, w_ins, w_del, w_sub)[len(t)]
+
+def operations_cost(operations: List[str], w_ins: int, w_del: int, w_sub: int) -> int:
+    weights = {'M': 0, 'I': w_ins, 'D': w_del, 'R': w_sub}
+    return sum(weights[op] for op in operations)
+
+def _hirschberg(s: str, t: str, w_ins: int, w_del: int, w_sub: int, operations: List[str]) -> None:
+    m: int = len(s)
+    n: int = len(t)
+    if m == 0:
+        operations.extend('I' * n)
+        return
+    if n == 0:
+        operations.extend('D' * m)
+        return
+    if m == 1 or n == 1 or m * n <= HIRSCHBERG_BASE_CELLS:
+        _, ops = levenshtein_tables(s, t, w_ins, w_del, w_sub)
+        operations.extend(traceback_operations(ops, m, n))
+        return
+
+    mid: int = m // 2
+    forward: List[int] = levenshtein_last_row(s[:mid], t, w_ins, w_del, w_sub)
+    backward: List[int] = levenshtein_last_row(s[mid:][::-1], t[::-1], w_ins, w_del, w_sub)
+
+    split: int = 0
+    best: int = forward[0] + backward[n]
+    for j in range(1, n + 1):
+        cost: int = forward[j] + backward[n - j]
+        if cost < best:
+            best = cost
+            split = j
+
+    _hirschberg(s[:mid], t[:split], w_ins, w_del, w_sub, operations)
+    _hirschberg(s[mid:], t[split:], w_ins, w_del, w_sub, operations)
+
+def hirschberg_levenshtein_distance(s: str, t: str, w_ins: int, w_del: int, w_sub: int) -> Tuple[int, List[str]]:
     operations: List[str] = []
-    i, j = m, n
-    while i > 0 or j > 0:
-        if ops[i][j] == 'M' or ops[i][j] == 'R':
-            operations.append(ops[i][j])
-            i -= 1
-            j -= 1
-        elif ops[i][j] == 'I':
-            operations.append('I')
-            j -= 1
-        elif ops[i][j] == 'D':
-            operations.append('D')
-            i -= 1
+    _hirschberg(s, t, w_ins, w_del, w_sub, operations)
 
-    operations.reverse()
-    return dp[m][n], operations
+    if DEBUG:
+        print(f"Hirschberg: длина редакционного предписания {len(operations)}")
+
+    return operations_cost(operations, w_ins, w_del, w_sub), operations
 
 def restrict_operations(index: int, char: str, cursed_set: Set[int]) -> Tuple[bool, bool]:
     if index not in cursed_set:
@@ -78,11 +160,118 @@ def restrict_operations(index: int, char: str, cursed_set: Set[int]) -> Tuple[bo
         return True, False
     return False, False
 
-def cursed_levenshtein_distance(s: str, t: str, cursed_indices: List[int], w_ins: int, w_del: int, w_sub: int) -> Tuple[int, List[str]]:
+def diagonal_band(m: int, n: int, w_ins: int, w_del: int, max_distance: int) -> Tuple[int, int]:
+    def indel_cost(shift: int) -> int:
+        return shift * w_ins if shift >= 0 else -shift * w_del
+
+    low: int = max(-m, -(max_distance // w_del))
+    high: int = min(n, max_distance // w_ins)
+    while low <= high and indel_cost(low) + indel_cost(n - m - low) > max_distance:
+        low += 1
+    while high >= low and indel_cost(high) + indel_cost(n - m - high) > max_distance:
+        high -= 1
+    return low, high
+
+def banded_levenshtein_distance(s: str, t: str, w_ins: int, w_del: int, w_sub: int, max_distance: int,
+                                cursed_set: Optional[Set[int]] = None, with_operations: bool = True) -> Tuple[int, List[str]]:
+    m: int = len(s)
+    n: int = len(t)
+    cursed: Set[int] = cursed_set if cursed_set is not None else set()
+    inf: float = float('inf')
+
+    low, high = diagonal_band(m, n, w_ins, w_del, max_distance)
+    if low > high:
+        return DISTANCE_EXCEEDED, []
+
+    starts: List[int] = [max(0, low)]
+    ops: List[List[str]] = [['I' if j > 0 else '' for j in range(starts[0], min(n, high) + 1)]]
+    prev: List[float] = [j * w_ins for j in range(starts[0], min(n, high) + 1)]
+    first_column_open: bool = True
+
+    for i in range(1, m + 1):
+        prev_start: int = starts[i-1]
+        prev_end: int = prev_start + len(prev) - 1
+        start: int = max(0, i + low)
+        end: int = min(n, i + high)
+        if start > end:
+            return DISTANCE_EXCEEDED, []
+
+        a: str = s[i-1]
+        can_delete, can_substitute = restrict_operations(i-1, a, cursed)
+        cur: List[float] = [inf] * (end - start + 1)
+        ops_row: List[str] = [''] * (end - start + 1)
+
+        for j in range(start, end + 1):
+            up: float = prev[j - prev_start] if prev_start <= j <= prev_end else inf
+            if j == 0:
+                first_column_open = first_column_open and can_delete
+                if first_column_open:
+                    cur[0] = i * w_del
+                    ops_row[0] = 'D'
+                continue
+            diag: float = prev[j - 1 - prev_start] if prev_start <= j - 1 <= prev_end else inf
+            if a == t[j-1]:
+                cur[j - start] = diag
+                ops_row[j - start] = 'M'
+                continue
+            insert_cost: float = cur[j - 1 - start] + w_ins if j > start else inf
+            delete_cost: float = up + w_del if can_delete else inf
+            substitute_cost: float = diag + w_sub if can_substitute else inf
+            value: float = min(insert_cost, delete_cost, substitute_cost)
+            cur[j - start] = value
+            if not with_operations:
+                continue
+
+            if value == insert_cost:
+                ops_row[j - start] = 'I'
+            elif value == delete_cost:
+                ops_row[j - start] = 'D'
+            elif value == substitute_cost:
+                ops_row[j - start] = 'R'
+            else:
+                ops_row[j - start] = 'X'
+
+        if min(cur) > max_distance:
+            if DEBUG:
+                print(f"Строка {i}: все значения полосы больше {max_distance}, досрочный выход")
+            return DISTANCE_EXCEEDED, []
+
+        starts.append(start)
+        if with_operations:
+            ops.append(ops_row)
+        prev = cur
+
+    distance: float = prev[n - starts[m]]
+    if distance > max_distance:
+        return DISTANCE_EXCEEDED, []
+    if not with_operations:
+        return int(distance), []
+
+    operations: List[str] = []
+    i, j = m, n
+    while i > 0 or j > 0:
+        op: str = ops[i][j - starts[i]]
+        operations.append(op)
+        if op == 'M' or op == 'R':
+            i -= 1
+            j -= 1
+        elif op == 'I':
+            j -= 1
+        else:
+            i -= 1
+
+    operations.reverse()
+    return int(distance), operations
+
+def cursed_levenshtein_distance(s: str, t: str, cursed_indices: List[int], w_ins: int, w_del: int, w_sub: int,
+                                max_distance: Optional[int] = None) -> Tuple[int, List[str]]:
     m: int = len(s)
     n: int = len(t)
     cursed_set: Set[int] = set(cursed_indices)
 
+    if max_distance is not None:
+        return banded_levenshtein_distance(s, t, w_ins, w_del, w_sub, max_distance, cursed_set)
+
     dp: List[List[float]] = [[float('inf')] * (n + 1) for _ in range(m + 1)]
     ops: List[List[str]] = [[''] * (n + 1) for _ in range(m + 1)]
 
@@ -137,21 +326,7 @@ def cursed_levenshtein_distance(s: str, t: str, cursed_indices: List[int], w_ins
         for row in ops:
             print(row)
 
-    operations: List[str] = []
-    i, j = m, n
-    while i > 0 or j > 0:
-        if ops[i][j] == 'M' or ops[i][j] == 'R':
-            operations.append(ops[i][j])
-            i -= 1
-            j -= 1
-        elif ops[i][j] == 'I':
-            operations.append('I')
-            j -= 1
-        elif ops[i][j] == 'D':
-            operations.append('D')
-            i -= 1
-
-    operations.reverse()
+    operations: List[str] = traceback_operations(ops, m, n)
     return int(dp[m][n]), operations
 
 def main() -> None:
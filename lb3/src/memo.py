@@ -0,0 +1,96 @@
+import sys
+from collections import OrderedDict, namedtuple
+from typing import FrozenSet, Hashable, List, Optional, Tuple
+
+from main import classic_levenshtein_distance, cursed_levenshtein_distance
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'size', 'hit_rate'])
+
+SWAPPED_OPERATIONS = {'I': 'D', 'D': 'I', 'M': 'M', 'R': 'R'}
+
+def common_affixes(s: str, t: str) -> Tuple[int, int]:
+    limit: int = min(len(s), len(t))
+    prefix: int = 0
+    while prefix < limit and s[prefix] == t[prefix]:
+        prefix += 1
+    suffix: int = 0
+    while suffix < limit - prefix and s[-1 - suffix] == t[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+def trimmed_levenshtein_distance(s: str, t: str, w_ins: int, w_del: int, w_sub: int) -> Tuple[int, List[str]]:
+    prefix, suffix = common_affixes(s, t)
+    if prefix == 0 and suffix == 0:
+        return classic_levenshtein_distance(s, t, w_ins, w_del, w_sub)
+    distance, operations = classic_levenshtein_distance(s[prefix:len(s) - suffix], t[prefix:len(t) - suffix], w_ins, w_del, w_sub)
+    return distance, ['M'] * prefix + operations + ['M'] * suffix
+
+class LevenshteinCache:
+    def __init__(self, maxsize: int = 65536, trim_affixes: bool = True) -> None:
+        if maxsize < 0:
+            raise ValueError("Размер кэша не может быть отрицательным")
+        self._maxsize: int = maxsize
+        self._trim: bool = trim_affixes
+        self._entries: 'OrderedDict[Hashable, Tuple[int, Tuple[str, ...]]]' = OrderedDict()
+        self._hits: int = 0
+        self._misses: int = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        total: int = self._hits + self._misses
+        return CacheStats(self._hits, self._misses, len(self._entries), self._hits / total if total else 0.0)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def _lookup(self, key: Hashable) -> Optional[Tuple[int, Tuple[str, ...]]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._hits += 1
+            self._entries.move_to_end(key)
+        else:
+            self._misses += 1
+        return entry
+
+    def _store(self, key: Hashable, distance: int, operations: List[str]) -> Tuple[int, Tuple[str, ...]]:
+        entry: Tuple[int, Tuple[str, ...]] = (distance, tuple(operations))
+        if self._maxsize == 0:
+            return entry
+        self._entries[key] = entry
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def classic_levenshtein_distance(self, s: str, t: str, w_ins: int, w_del: int, w_sub: int) -> Tuple[int, List[str]]:
+        swapped: bool = w_ins == w_del and t < s
+        a, b = (t, s) if swapped else (s, t)
+        key: Hashable = ('classic', sys.intern(a), sys.intern(b), w_ins, w_del, w_sub)
+
+        entry = self._lookup(key)
+        if entry is None:
+            if self._trim:
+                distance, operations = trimmed_levenshtein_distance(a, b, w_ins, w_del, w_sub)
+            else:
+                distance, operations = classic_levenshtein_distance(a, b, w_ins, w_del, w_sub)
+            entry = self._store(key, distance, operations)
+
+        distance, stored = entry
+        if swapped:
+            return distance, [SWAPPED_OPERATIONS[op] for op in stored]
+        return distance, list(stored)
+
+    def cursed_levenshtein_distance(self, s: str, t: str, cursed_indices: List[int], w_ins: int, w_del: int, w_sub: int) -> Tuple[int, List[str]]:
+        cursed: FrozenSet[int] = frozenset(cursed_indices)
+        if not cursed:
+            return self.classic_levenshtein_distance(s, t, w_ins, w_del, w_sub)
+        key: Hashable = ('cursed', sys.intern(s), sys.intern(t), cursed, w_ins, w_del, w_sub)
+
+        entry = self._lookup(key)
+        if entry is None:
+            distance, operations = cursed_levenshtein_distance(s, t, sorted(cursed), w_ins, w_del, w_sub)
+            entry = self._store(key, distance, operations)
+
+        distance, stored = entry
+        return distance, list(stored)
@@ -0,0 +1,97 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from edit_script import OP_DELETE, OP_INSERT, OP_MATCH, OP_REPLACE, PackedOperations, expand_runs, iter_edit_runs
+from main import DISTANCE_EXCEEDED, restrict_operations
+
+def cursed_masks(s: str, cursed_indices: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    cursed_set = set(cursed_indices)
+    can_delete: np.ndarray = np.ones(len(s), dtype=bool)
+    can_substitute: np.ndarray = np.ones(len(s), dtype=bool)
+    for index in cursed_set:
+        if 0 <= index < len(s):
+            can_delete[index], can_substitute[index] = restrict_operations(index, s[index], cursed_set)
+    return can_delete, can_substitute
+
+def _encode(s: str, t: str) -> Tuple[np.ndarray, np.ndarray]:
+    alphabet = {c: code for code, c in enumerate(sorted(set(s) | set(t)))}
+    return (np.fromiter((alphabet[c] for c in s), dtype=np.int32, count=len(s)),
+            np.fromiter((alphabet[c] for c in t), dtype=np.int32, count=len(t)))
+
+def vectorized_levenshtein_alignment(s: str, t: str, w_ins: int, w_del: int, w_sub: int,
+                                     can_delete: Optional[np.ndarray] = None,
+                                     can_substitute: Optional[np.ndarray] = None) -> Tuple[float, PackedOperations]:
+    m: int = len(s)
+    n: int = len(t)
+    if can_delete is None:
+        can_delete = np.ones(m, dtype=bool)
+    if can_substitute is None:
+        can_substitute = np.ones(m, dtype=bool)
+
+    inf: int = (m + n + 1) * max(w_ins, w_del, w_sub) + 1
+    segment_shift: int = 2 * inf + (n + 1) * w_ins
+    if (n + 2) * segment_shift >= np.iinfo(np.int64).max:
+        raise OverflowError("Веса операций слишком велики для векторизованного ядра")
+
+    s_codes, t_codes = _encode(s, t)
+    columns: np.ndarray = np.arange(n + 1, dtype=np.int64)
+    insert_ramp: np.ndarray = columns * w_ins
+    unreachable: np.ndarray = np.full(n, inf, dtype=np.int64)
+
+    ops: PackedOperations = PackedOperations(m, n)
+    codes: np.ndarray = np.full(n + 1, OP_INSERT, dtype=np.uint8)
+    ops.set_row(0, codes)
+    codes[0] = OP_DELETE
+    prev: np.ndarray = insert_ramp.copy()
+    reset: np.ndarray = np.zeros(n + 1, dtype=bool)
+    reset[0] = True
+
+    for i in range(1, m + 1):
+        diag: np.ndarray = prev[:-1]
+        up: np.ndarray = prev[1:]
+        match: np.ndarray = t_codes == s_codes[i-1]
+
+        delete_cost: np.ndarray = np.minimum(up + w_del, inf) if can_delete[i-1] else unreachable
+        substitute_cost: np.ndarray = np.minimum(diag + w_sub, inf) if can_substitute[i-1] else unreachable
+
+        start: np.ndarray = np.empty(n + 1, dtype=np.int64)
+        start[0] = i * w_del if can_delete[i-1] else inf
+        start[1:] = np.where(match, diag, np.minimum(delete_cost, substitute_cost))
+
+        reset[1:] = match
+        segment: np.ndarray = np.cumsum(reset) * segment_shift
+        cur: np.ndarray = np.minimum.accumulate(start - insert_ramp - segment) + segment + insert_ramp
+        np.minimum(cur, inf, out=cur)
+
+        insert_cost: np.ndarray = np.minimum(cur[:-1] + w_ins, inf)
+        value: np.ndarray = cur[1:]
+        codes[1:] = np.select(
+            [match, value == insert_cost, value == delete_cost, value == substitute_cost],
+            [OP_MATCH, OP_INSERT, OP_DELETE, OP_REPLACE],
+            OP_INSERT,
+        )
+        ops.set_row(i, codes)
+        prev = cur
+
+    distance: float = float(prev[n]) if prev[n] < inf else float('inf')
+    return distance, ops
+
+def vectorized_levenshtein_distance(s: str, t: str, w_ins: int, w_del: int, w_sub: int,
+                                    can_delete: Optional[np.ndarray] = None,
+                                    can_substitute: Optional[np.ndarray] = None) -> Tuple[float, List[str]]:
+    distance, ops = vectorized_levenshtein_alignment(s, t, w_ins, w_del, w_sub, can_delete, can_substitute)
+    if distance == float('inf'):
+        return float('inf'), []
+    return distance, expand_runs(iter_edit_runs(ops, len(s), len(t)))
+
+def vectorized_classic_levenshtein_distance(s: str, t: str, w_ins: int, w_del: int, w_sub: int) -> Tuple[int, List[str]]:
+    distance, operations = vectorized_levenshtein_distance(s, t, w_ins, w_del, w_sub)
+    return int(distance), operations
+
+def vectorized_cursed_levenshtein_distance(s: str, t: str, cursed_indices: List[int], w_ins: int, w_del: int, w_sub: int) -> Tuple[int, List[str]]:
+    can_delete, can_substitute = cursed_masks(s, cursed_indices)
+    distance, operations = vectorized_levenshtein_distance(s, t, w_ins, w_del, w_sub, can_delete, can_substitute)
+    if distance == float('inf'):
+        return DISTANCE_EXCEEDED, []
+    return int(distance), operations
@@ -0,0 +1,118 @@
+from laba import *
+from time import perf_counter
+from random import seed
+from random import choice
+from random import randint
+from pathlib import Path
+from typing import Callable
+from pandas import DataFrame
+
+TEXT_LENGTH : Final[int] = 1 << 20
+REPEATS : Final[int] = 3
+PATTERN_LENGTHS : Final[tuple[int, ...]] = (3, 8, 32, 128)
+REAL_CORPUS_GLOB : Final[str] = "*/src/*.py"
+
+
+
+def random_text(length : uint, alphabet : str) -> str:
+    return "".join(choice(alphabet) for _ in range(length))
+
+
+
+def best_time(function : Callable[[], object], repeats : uint = REPEATS) -> float:
+    best : float = float("inf")
+    for _ in range(repeats):
+        time_start : float = perf_counter()
+        function()
+        best = min(best, perf_counter() - time_start)
+    return best
+
+
+
+def bench_kmp_automaton(text_length : uint = TEXT_LENGTH) -> DataFrame:
+    seed(0)
+    cases : list[tuple[str, str, str]] = [
+        ("ДНК, короткий шаблон", "ACGT", "ACGTAC"),
+        ("ДНК, длинный шаблон", "ACGT", "ACGTACGTTGCAACGTAGCT"),
+        ("Бинарный, повторы", "ab", "abababababab"),
+        ("Латиница", "abcdefghijklmnopqrstuvwxyz", "signature"),
+        ("Кириллица", "абвгдеёжзийклмнопрстуфхцчшщъыьэюя", "подпись"),
+    ]
+    rows : list[dict] = []
+
+    for name, alphabet, pattern in cases:
+        text : str = random_text(text_length, alphabet)
+        data : bytes = text.encode()
+        compiled : CompiledKMP = compile_pattern(pattern)
+        automaton : KMPAutomaton = KMPAutomaton(pattern)
+        dense : KMPAutomaton = KMPAutomaton(pattern.encode())
+        assert compiled.findall(text) == automaton.findall(text)
+        assert compiled.count(text) == dense.count(data)
+
+        # ASCII-шаблон по ASCII-тексту идёт через сокращённую таблицу, остальное - через словари переходов
+        reduced : bool = automaton.columns > 0 and text.isascii()
+        automaton_time : float = best_time(lambda: automaton.count(text))
+        rows.append({
+            "Случай": name,
+            "LPS (str), с": best_time(lambda: compiled.count(text)),
+            "DFA сокращённая таблица (str), с": automaton_time if reduced else None,
+            "DFA dict (str), с": None if reduced else automaton_time,
+            "DFA таблица (bytes), с": best_time(lambda: dense.count(data)),
+            "DFA таблица (memoryview), с": best_time(lambda: dense.count(memoryview(data))),
+        })
+
+    return DataFrame(rows)
+
+
+
+def real_corpus() -> str:
+    root : Path = Path(__file__).resolve().parents[2]
+    return "".join(path.read_text(encoding="utf-8") for path in sorted(root.glob(REAL_CORPUS_GLOB)))
+
+
+
+def bench_engines(text_length : uint = TEXT_LENGTH) -> DataFrame:
+    seed(1)
+    corpora : dict[str, str] = {
+        "Случайный бинарный": random_text(text_length, "ab"),
+        "Случайная ДНК": random_text(text_length, "ACGT"),
+        "Случайная латиница": random_text(text_length, "abcdefghijklmnopqrstuvwxyz "),
+        "Исходники репозитория": real_corpus(),
+    }
+    rows : list[dict] = []
+
+    for corpus_name, text in corpora.items():
+        data : bytes = text.encode()
+        for pattern_length in PATTERN_LENGTHS:
+            if pattern_length > len(data):
+                continue
+            start : uint = randint(0, len(data) - pattern_length)
+            pattern : bytes = data[start:start + pattern_length]
+            engines : dict[str, Matcher] = {
+                "KMP": compile_pattern(pattern),
+                "KMP DFA": KMPAutomaton(pattern),
+                "Horspool": HorspoolMatcher(pattern),
+                "Two-way": TwoWayMatcher(pattern),
+            }
+            expected : list[uint] = engines["KMP"].findall(data)
+            row : dict = {"Корпус": corpus_name, "Длина шаблона": pattern_length}
+            for engine_name, engine in engines.items():
+                assert engine.findall(data) == expected
+                row[f"{engine_name}, с"] = best_time(lambda: engine.count(data))
+            timings : dict[str, float] = {name: row[f"{name}, с"] for name in engines}
+            row["Победитель"] = min(timings, key=timings.get)
+            row["Автовыбор"] = type(select_matcher(pattern)).__name__
+            rows.append(row)
+
+    return DataFrame(rows)
+
+
+
+def main() -> None:
+    Console().print(bench_kmp_automaton().to_string(index=False), style=GREEN_DEBUG_COLOR)
+    Console().print(bench_engines().to_string(index=False), style=GREEN_DEBUG_COLOR)
+
+
+
+if __name__ == "__main__":
+    main()
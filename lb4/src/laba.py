@@ -1,5 +1,14 @@
+import os
+from abc import ABC, abstractmethod
 from pydantic.types import PositiveInt as uint
-from typing import Final
+from typing import Callable, Final, Iterable, Iterator, Optional, Union
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from collections import namedtuple
+from time import perf_counter
+from array import array
+from mmap import mmap, ACCESS_READ
+from multiprocessing.shared_memory import SharedMemory
 from rich.console import Console
 
 RED_DEBUG_COLOR : Final[str] = "red"
@@ -7,13 +16,111 @@ BLUE_DEBUG_COLOR : Final[str] = "blue"
 GREEN_DEBUG_COLOR : Final[str] = "green"
 YELLOW_DEBUG_COLOR : Final[str] = "yellow"
 
+STREAM_CHUNK_SIZE : Final[int] = 1 << 20
+BYTE_ALPHABET_SIZE : Final[int] = 256
+SKIP_SEARCH_MIN_LENGTH : Final[int] = 4
+SMALL_ALPHABET_SIZE : Final[int] = 2
+TWO_WAY_MIN_LENGTH : Final[int] = 32
+
+Symbols = Union[str, bytes]
+
+
+
+class SearchStats(namedtuple('SearchStats', ['symbols', 'fallbacks', 'matches', 'elapsed'])):
+    @property
+    def checks(self) -> uint:
+        return self.symbols + self.fallbacks
+
+
+
+    @property
+    def checks_per_symbol(self) -> float:
+        return self.checks / self.symbols if self.symbols else 0.0
+
+
+
+    @property
+    def symbols_per_second(self) -> float:
+        return self.symbols / self.elapsed if self.elapsed > 0 else 0.0
+
+
+
+ProgressCallback = Callable[[SearchStats], None]
+
+
+
+def _scan_block(text : Symbols, pattern : Symbols, lps : list[uint], i : uint, j : uint, end : uint,
+                result : list[uint]) -> tuple[uint, uint, uint]:
+    pattern_length : uint = len(pattern)
+    fallbacks : uint = 0
+    while i < end:
+        if text[i] == pattern[j]:
+            i += 1
+            j += 1
+            if j == pattern_length:
+                result.append(i - j)
+                j = lps[j - 1]
+        elif j:
+            fallbacks += 1
+            j = lps[j - 1]
+        else:
+            i += 1
+    return i, j, fallbacks
+
+
+
+def build_longest_prefix_suffix(pattern : Symbols) -> list[uint]:
+    pattern_length : uint = len(pattern)
+    longestPrefixSuffix : list[uint] = [0] * pattern_length
+    current_length : uint = 0
+    i : uint = 1
+    while i < pattern_length:
+        if pattern[i] == pattern[current_length]:
+            current_length += 1
+            longestPrefixSuffix[i] = current_length
+            i += 1
+        elif current_length != 0:
+            current_length = longestPrefixSuffix[current_length - 1]
+        else:
+            i += 1
+    return longestPrefixSuffix
+
+
+
+def reduced_alphabet(pattern : str) -> tuple[bytes, uint]:
+    translation : bytearray = bytearray(BYTE_ALPHABET_SIZE)
+    for code, symbol in enumerate(sorted(set(pattern.encode("ascii"))), 1):
+        translation[symbol] = code
+    return bytes(translation), len(set(pattern)) + 1
+
+
+
+def iter_chunks(source : Union[Iterable[Symbols], object], chunk_size : uint = STREAM_CHUNK_SIZE) -> Iterator[Symbols]:
+    if hasattr(source, "read"):
+        read = source.read
+    elif hasattr(source, "recv"):
+        read = source.recv
+    else:
+        yield from source
+        return
+    while True:
+        chunk : Symbols = read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
 
 
 class KMP:
-    def __init__(self, text: str, pattern: str, debug_mode: bool = False) -> None:
+    def __init__(self, text: str, pattern: str, debug_mode: bool = False,
+                 sample_every: uint = 0, progress: Optional[ProgressCallback] = None) -> None:
         self._text: str = text
         self._pattern: str = pattern
         self._debug: bool = debug_mode
+        self._sample_every: uint = sample_every
+        self._progress: Optional[ProgressCallback] = progress
+        self._trace: list[tuple[uint, uint]] = []
+        self._stats: SearchStats = SearchStats(0, 0, 0, 0.0)
         self._longestPrefixSuffix = self._makeLongestPrefixSuffix()
         self._result: list[uint] = self._search() if KMP._validate_data(text, pattern) else [-1]
 
@@ -47,6 +154,18 @@ class KMP:
 
 
 
+    @property
+    def stats(self) -> SearchStats:
+        return self._stats
+
+
+
+    @property
+    def trace(self) -> list[tuple[uint, uint]]:
+        return self._trace
+
+
+
     def _makeLongestPrefixSuffix(self) -> list[uint]:
         pattern : str = self._pattern
         text : str = self._text
@@ -99,9 +218,39 @@ class KMP:
 
 
     def _search(self) -> list[uint]:
+        if self._debug:
+            return self._search_debug()
+
         text : str = self._text
         pattern : str = self._pattern
-        debug_mode : bool = self._debug
+        lps : list[uint] = self._longestPrefixSuffix
+        progress : Optional[ProgressCallback] = self._progress
+        sampling : bool = self._sample_every > 0
+        text_length : uint = len(text)
+        block : uint = self._sample_every if sampling else text_length
+        result_search : list[uint] = []
+        fallbacks : uint = 0
+        i = j = 0
+        time_start : float = perf_counter()
+
+        while i < text_length:
+            i, j, block_fallbacks = _scan_block(text, pattern, lps, i, j, min(i + block, text_length), result_search)
+            fallbacks += block_fallbacks
+            if sampling:
+                self._trace.append((i, j))
+                if progress is not None:
+                    progress(SearchStats(i, fallbacks, len(result_search), perf_counter() - time_start))
+
+        self._stats = SearchStats(text_length, fallbacks, len(result_search), perf_counter() - time_start)
+        return result_search if result_search else [-1]
+
+
+
+    def _search_debug(self) -> list[uint]:
+        text : str = self._text
+        pattern : str = self._pattern
+        console : Console = Console()
+        time_start : float = perf_counter()
         text_length = len(text)
         pattern_length = len(pattern)
         result_search : list[int] = []
@@ -110,23 +259,20 @@ class KMP:
         total_checks : uint = 0
         skip_count : uint = 0
 
-        if debug_mode:
-            Console().print("\n" + "="*50, style=BLUE_DEBUG_COLOR)
-            Console().print(f"[Поиск] Начало поиска '{pattern}' в тексте с длиной {text_length}", style=BLUE_DEBUG_COLOR)
-            Console().print(f"[Поиск] LPS массив: {lps}", style=BLUE_DEBUG_COLOR)
+        console.print("\n" + "="*50, style=BLUE_DEBUG_COLOR)
+        console.print(f"[Поиск] Начало поиска '{pattern}' в тексте с длиной {text_length}", style=BLUE_DEBUG_COLOR)
+        console.print(f"[Поиск] LPS массив: {lps}", style=BLUE_DEBUG_COLOR)
 
         while i < text_length:
             total_checks += 1
-            if debug_mode:
-                visual_text = text[:i] + "[" + text[i] + "]" + text[i+1:]
-                visual_pattern = " "*(i-j) + pattern[:j] + "[" + pattern[j] + "]" + pattern[j+1:] if j < pattern_length else ""
-                Console().print(f"\n[Шаг {total_checks}] i={i}, j={j}", style=BLUE_DEBUG_COLOR)
-                Console().print(f"Текст:  {visual_text}", style=BLUE_DEBUG_COLOR)
-                Console().print(f"Шаблон: {visual_pattern}", style=BLUE_DEBUG_COLOR)
+            visual_text = text[:i] + "[" + text[i] + "]" + text[i+1:]
+            visual_pattern = " "*(i-j) + pattern[:j] + "[" + pattern[j] + "]" + pattern[j+1:] if j < pattern_length else ""
+            console.print(f"\n[Шаг {total_checks}] i={i}, j={j}", style=BLUE_DEBUG_COLOR)
+            console.print(f"Текст:  {visual_text}", style=BLUE_DEBUG_COLOR)
+            console.print(f"Шаблон: {visual_pattern}", style=BLUE_DEBUG_COLOR)
 
             if j < pattern_length and text[i] == pattern[j]:
-                if debug_mode:
-                    Console().print(f"Совпадение '{text[i]}' → увеличиваем оба указателя", style=GREEN_DEBUG_COLOR)
+                console.print(f"Совпадение '{text[i]}' → увеличиваем оба указателя", style=GREEN_DEBUG_COLOR)
                 
                 i += 1
                 j += 1
@@ -135,28 +281,25 @@ class KMP:
                     pos : uint  = i - j
                     result_search.append(pos)
                     j = lps[j-1]
-                    if debug_mode:
-                        Console().print(f"\n!!! НАЙДЕНО СОВПАДЕНИЕ НА ПОЗИЦИИ {pos} !!!", style=GREEN_DEBUG_COLOR)
-                        Console().print(f"Указатель j <- LPS[j - 1] j={j}", style=GREEN_DEBUG_COLOR)
+                    console.print(f"\n!!! НАЙДЕНО СОВПАДЕНИЕ НА ПОЗИЦИИ {pos} !!!", style=GREEN_DEBUG_COLOR)
+                    console.print(f"Указатель j <- LPS[j - 1] j={j}", style=GREEN_DEBUG_COLOR)
             else:
                 if j != 0:
                     skip_count += 1
                     new_j = lps[j-1]
-                    if debug_mode:
-                        Console().print(f"Несовпадение! j ← LPS[{j-1}] = {new_j}", style=RED_DEBUG_COLOR)
+                    console.print(f"Несовпадение! j ← LPS[{j-1}] = {new_j}", style=RED_DEBUG_COLOR)
                     j = new_j
                 else:
-                    if debug_mode:
-                        Console().print("Несовпадение! Увеличиваем i", style=RED_DEBUG_COLOR)
+                    console.print("Несовпадение! Увеличиваем i", style=RED_DEBUG_COLOR)
                     i += 1
 
-        if debug_mode:
-            Console().print("\nСтатистика:")
-            Console().print(f"Всего проверок символов: {total_checks}", style=BLUE_DEBUG_COLOR)
-            Console().print(f"Пропусков через LPS: {skip_count}", style=BLUE_DEBUG_COLOR)
-            Console().print(f"Найдено совпадений: {len(result_search) if result_search else 0}", style=BLUE_DEBUG_COLOR)
-            Console().print("="*50, style=BLUE_DEBUG_COLOR)
+        console.print("\nСтатистика:")
+        console.print(f"Всего проверок символов: {total_checks}", style=BLUE_DEBUG_COLOR)
+        console.print(f"Пропусков через LPS: {skip_count}", style=BLUE_DEBUG_COLOR)
+        console.print(f"Найдено совпадений: {len(result_search) if result_search else 0}", style=BLUE_DEBUG_COLOR)
+        console.print("="*50, style=BLUE_DEBUG_COLOR)
 
+        self._stats = SearchStats(text_length, skip_count, len(result_search), perf_counter() - time_start)
         return result_search if result_search else [-1]
 
 
@@ -166,6 +309,525 @@ class KMP:
 
 
 
+class Matcher(ABC):
+    def __init__(self, pattern : Symbols) -> None:
+        if len(pattern) == 0:
+            raise ValueError("Шаблон не может быть пустым")
+        self._pattern : Symbols = pattern
+
+
+
+    @property
+    def pattern(self) -> Symbols:
+        return self._pattern
+
+
+
+    @abstractmethod
+    def finditer(self, text : Symbols) -> Iterator[uint]:
+        ...
+
+
+
+    def findall(self, text : Symbols) -> list[uint]:
+        return list(self.finditer(text))
+
+
+
+    def count(self, text : Symbols) -> uint:
+        return sum(1 for _ in self.finditer(text))
+
+
+
+    def first(self, text : Symbols) -> int:
+        return next(self.finditer(text), -1)
+
+
+
+class CompiledKMP(Matcher):
+    def __init__(self, pattern : Symbols) -> None:
+        super().__init__(pattern)
+        self._longestPrefixSuffix : list[uint] = build_longest_prefix_suffix(pattern)
+
+
+
+    @property
+    def longestPrefixSuffix(self) -> list[uint]:
+        return self._longestPrefixSuffix
+
+
+
+    def finditer(self, text : Symbols) -> Iterator[uint]:
+        if not KMP._validate_data(text, self._pattern):
+            return
+        pattern : Symbols = self._pattern
+        lps : list[uint] = self._longestPrefixSuffix
+        pattern_length : uint = len(pattern)
+        j : uint = 0
+
+        for i, symbol in enumerate(text):
+            while j and symbol != pattern[j]:
+                j = lps[j - 1]
+            if symbol == pattern[j]:
+                j += 1
+                if j == pattern_length:
+                    yield i - pattern_length + 1
+                    j = lps[j - 1]
+
+
+
+    def search_many(self, texts : Iterable[Symbols], workers : Optional[int] = None, use_processes : bool = True) -> list[list[uint]]:
+        texts = list(texts)
+        if workers == 1 or len(texts) < 2:
+            return [self.findall(text) for text in texts]
+        pool : Executor = ProcessPoolExecutor(workers) if use_processes else ThreadPoolExecutor(workers)
+        with pool:
+            return list(pool.map(self.findall, texts, chunksize=max(1, len(texts) // (4 * (workers or os.cpu_count() or 1)))))
+
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(pattern : Symbols) -> CompiledKMP:
+    return CompiledKMP(pattern)
+
+
+
+def compile_pattern(pattern : Union[Symbols, bytearray]) -> CompiledKMP:
+    return _compile_cached(bytes(pattern) if isinstance(pattern, bytearray) else pattern)
+
+
+
+class KMPAutomaton(Matcher):
+    def __init__(self, pattern : Symbols) -> None:
+        compiled : CompiledKMP = compile_pattern(pattern)
+        super().__init__(pattern)
+        self._longestPrefixSuffix : list[uint] = compiled.longestPrefixSuffix
+        self._dense : bool = isinstance(pattern, (bytes, bytearray))
+        self._translation : Optional[bytes] = None
+        if self._dense:
+            self._codes : bytes = bytes(pattern)
+            self._width : uint = BYTE_ALPHABET_SIZE
+        else:
+            self._rows : list[dict[str, uint]] = self._build_sparse()
+            if pattern.isascii():
+                self._translation, self._width = reduced_alphabet(pattern)
+                self._codes = pattern.encode("ascii").translate(self._translation)
+        if self._dense or self._translation is not None:
+            self._table : array = self._build_dense()
+
+
+
+    @property
+    def states(self) -> uint:
+        return len(self._pattern) + 1
+
+
+
+    @property
+    def columns(self) -> uint:
+        return self._width if self._dense or self._translation is not None else 0
+
+
+
+    def _build_dense(self) -> array:
+        pattern : bytes = self._codes
+        width : uint = self._width
+        lps : list[uint] = self._longestPrefixSuffix
+        pattern_length : uint = len(pattern)
+        table : array = array("I", bytes(4 * width * (pattern_length + 1)))
+        # Переходы хранят смещение строки целевого состояния, а не его номер
+        table[pattern[0]] = width
+        for state in range(1, pattern_length + 1):
+            row : uint = state * width
+            fallback : uint = lps[state - 1] * width
+            table[row:row + width] = table[fallback:fallback + width]
+            if state < pattern_length:
+                table[row + pattern[state]] = row + width
+        return table
+
+
+
+    def _build_sparse(self) -> list[dict[str, uint]]:
+        pattern : str = self._pattern
+        lps : list[uint] = self._longestPrefixSuffix
+        pattern_length : uint = len(pattern)
+        rows : list[dict[str, uint]] = [{pattern[0]: 1}]
+        for state in range(1, pattern_length + 1):
+            row : dict[str, uint] = dict(rows[lps[state - 1]])
+            if state < pattern_length:
+                row[pattern[state]] = state + 1
+            rows.append(row)
+        return rows
+
+
+
+    def finditer(self, text : Union[Symbols, memoryview]) -> Iterator[uint]:
+        if len(text) < len(self._pattern):
+            return
+        if self._dense:
+            yield from self._finditer_dense(text)
+        elif self._translation is not None and text.isascii():
+            yield from self._finditer_dense(text.encode("ascii").translate(self._translation))
+        else:
+            yield from self._finditer_sparse(text)
+
+
+
+    def _finditer_dense(self, text : Union[bytes, bytearray, memoryview, mmap], start : uint = 0, end : Optional[uint] = None) -> Iterator[uint]:
+        table : array = self._table
+        accept : uint = len(self._pattern)
+        accept_row : uint = accept * self._width
+        first : bytes = self._codes[:1]
+        text_length : uint = len(text) if end is None else end
+        searchable : bool = hasattr(text, "find")
+        state : uint = 0
+        i : uint = start
+
+        while i < text_length:
+            if state == 0 and searchable:
+                i = text.find(first, i, text_length)
+                if i < 0:
+                    return
+            state = table[state + text[i]]
+            if state == accept_row:
+                yield i - accept + 1
+            i += 1
+
+
+
+    def finditer_range(self, text : Union[bytes, bytearray, memoryview, mmap], start : uint, end : uint) -> Iterator[uint]:
+        if not self._dense:
+            raise TypeError("Поиск по диапазону поддерживается только для байтовых шаблонов")
+        yield from self._finditer_dense(text, start, end)
+
+
+
+    def _finditer_sparse(self, text : str) -> Iterator[uint]:
+        rows : list[dict[str, uint]] = self._rows
+        accept : uint = len(self._pattern)
+        first : str = self._pattern[0]
+        text_length : uint = len(text)
+        state : uint = 0
+        i : uint = 0
+
+        while i < text_length:
+            if state == 0:
+                i = text.find(first, i)
+                if i < 0:
+                    return
+            state = rows[state].get(text[i], 0)
+            if state == accept:
+                yield i - accept + 1
+            i += 1
+
+
+
+class HorspoolMatcher(Matcher):
+    def __init__(self, pattern : Symbols) -> None:
+        super().__init__(pattern)
+        pattern_length : uint = len(pattern)
+        self._dense : bool = isinstance(pattern, (bytes, bytearray))
+        if self._dense:
+            self._shift : Union[list[uint], dict[str, uint]] = [pattern_length] * BYTE_ALPHABET_SIZE
+        else:
+            self._shift = {}
+        for i in range(pattern_length - 1):
+            self._shift[pattern[i]] = pattern_length - 1 - i
+
+
+
+    def finditer(self, text : Symbols) -> Iterator[uint]:
+        pattern : Symbols = self._pattern
+        pattern_length : uint = len(pattern)
+        last : uint = pattern_length - 1
+        last_symbol = pattern[last]
+        prefix : Symbols = pattern[:last]
+        shift = self._shift
+        limit : uint = len(text) - pattern_length
+        i : uint = 0
+
+        if self._dense:
+            while i <= limit:
+                symbol : uint = text[i + last]
+                if symbol == last_symbol and text[i:i + last] == prefix:
+                    yield i
+                i += shift[symbol]
+        else:
+            while i <= limit:
+                symbol : str = text[i + last]
+                if symbol == last_symbol and text.startswith(pattern, i):
+                    yield i
+                i += shift.get(symbol, pattern_length)
+
+
+
+class TwoWayMatcher(Matcher):
+    def __init__(self, pattern : Symbols) -> None:
+        super().__init__(pattern)
+        suffix, period = TwoWayMatcher._maximal_suffix(pattern, False)
+        suffix_tilde, period_tilde = TwoWayMatcher._maximal_suffix(pattern, True)
+        if suffix > suffix_tilde:
+            self._critical : int = suffix
+            self._period : uint = period
+        else:
+            self._critical = suffix_tilde
+            self._period = period_tilde
+        critical : int = self._critical
+        self._periodic : bool = pattern[:critical + 1] == pattern[self._period:self._period + critical + 1]
+        if not self._periodic:
+            self._period = max(critical + 1, len(pattern) - critical - 1) + 1
+
+
+
+    @staticmethod
+    def _maximal_suffix(pattern : Symbols, reverse : bool) -> tuple[int, uint]:
+        pattern_length : uint = len(pattern)
+        suffix : int = -1
+        j : uint = 0
+        k : uint = 1
+        period : uint = 1
+        while j + k < pattern_length:
+            a = pattern[j + k]
+            b = pattern[suffix + k]
+            if (a > b) if reverse else (a < b):
+                j += k
+                k = 1
+                period = j - suffix
+            elif a == b:
+                if k != period:
+                    k += 1
+                else:
+                    j += period
+                    k = 1
+            else:
+                suffix = j
+                j = suffix + 1
+                k = period = 1
+        return suffix, period
+
+
+
+    def finditer(self, text : Symbols) -> Iterator[uint]:
+        pattern : Symbols = self._pattern
+        pattern_length : uint = len(pattern)
+        critical : int = self._critical
+        period : uint = self._period
+        limit : uint = len(text) - pattern_length
+        j : uint = 0
+
+        if self._periodic:
+            memory : int = -1
+            while j <= limit:
+                i : int = max(critical, memory) + 1
+                while i < pattern_length and pattern[i] == text[i + j]:
+                    i += 1
+                if i >= pattern_length:
+                    i = critical
+                    while i > memory and pattern[i] == text[i + j]:
+                        i -= 1
+                    if i <= memory:
+                        yield j
+                    j += period
+                    memory = pattern_length - period - 1
+                else:
+                    j += i - critical
+                    memory = -1
+        else:
+            while j <= limit:
+                i = critical + 1
+                while i < pattern_length and pattern[i] == text[i + j]:
+                    i += 1
+                if i >= pattern_length:
+                    i = critical
+                    while i >= 0 and pattern[i] == text[i + j]:
+                        i -= 1
+                    if i < 0:
+                        yield j
+                    j += period
+                else:
+                    j += i - critical
+
+
+
+def select_matcher(pattern : Symbols) -> Matcher:
+    pattern_length : uint = len(pattern)
+    if pattern_length < SKIP_SEARCH_MIN_LENGTH:
+        return KMPAutomaton(pattern)
+    if pattern_length >= TWO_WAY_MIN_LENGTH and len(set(pattern)) <= SMALL_ALPHABET_SIZE:
+        return TwoWayMatcher(pattern)
+    return HorspoolMatcher(pattern)
+
+
+
+class StreamingKMP:
+    def __init__(self, pattern : Symbols) -> None:
+        compiled : CompiledKMP = compile_pattern(pattern)
+        self._pattern : Symbols = pattern
+        self._longestPrefixSuffix : list[uint] = compiled.longestPrefixSuffix
+        self._matched : uint = 0
+        self._offset : uint = 0
+        self._fallbacks : uint = 0
+        self._matches : uint = 0
+        self._elapsed : float = 0.0
+
+
+
+    @property
+    def pattern(self) -> Symbols:
+        return self._pattern
+
+
+
+    @property
+    def longestPrefixSuffix(self) -> list[uint]:
+        return self._longestPrefixSuffix
+
+
+
+    @property
+    def offset(self) -> uint:
+        return self._offset
+
+
+
+    @property
+    def stats(self) -> SearchStats:
+        return SearchStats(self._offset, self._fallbacks, self._matches, self._elapsed)
+
+
+
+    def reset(self) -> None:
+        self._matched = 0
+        self._offset = 0
+        self._fallbacks = 0
+        self._matches = 0
+        self._elapsed = 0.0
+
+
+
+    def feed(self, chunk : Symbols) -> list[uint]:
+        pattern : Symbols = self._pattern
+        lps : list[uint] = self._longestPrefixSuffix
+        pattern_length : uint = len(pattern)
+        base : uint = self._offset - pattern_length + 1
+        j : uint = self._matched
+        fallbacks : uint = 0
+        result : list[uint] = []
+        time_start : float = perf_counter()
+
+        for i, symbol in enumerate(chunk):
+            while j and symbol != pattern[j]:
+                j = lps[j - 1]
+                fallbacks += 1
+            if symbol == pattern[j]:
+                j += 1
+                if j == pattern_length:
+                    result.append(base + i)
+                    j = lps[j - 1]
+
+        self._matched = j
+        self._offset += len(chunk)
+        self._fallbacks += fallbacks
+        self._matches += len(result)
+        self._elapsed += perf_counter() - time_start
+        return result
+
+
+
+    def scan(self, source : Union[Iterable[Symbols], object], chunk_size : uint = STREAM_CHUNK_SIZE,
+             progress : Optional[ProgressCallback] = None) -> Iterator[uint]:
+        for chunk in iter_chunks(source, chunk_size):
+            yield from self.feed(chunk)
+            if progress is not None:
+                progress(self.stats)
+
+
+
+def scan_file(path : str, pattern : Symbols, chunk_size : uint = STREAM_CHUNK_SIZE) -> Iterator[uint]:
+    matcher : StreamingKMP = StreamingKMP(pattern)
+    if isinstance(pattern, bytes):
+        with open(path, "rb") as source:
+            yield from matcher.scan(source, chunk_size)
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as source:
+            yield from matcher.scan(source, chunk_size)
+
+
+
+def _search_mmap_shard(path : str, pattern : bytes, start : uint, end : uint) -> list[uint]:
+    automaton : KMPAutomaton = KMPAutomaton(pattern)
+    with open(path, "rb") as source, mmap(source.fileno(), 0, access=ACCESS_READ) as mapped:
+        scan_end : uint = min(end + len(pattern) - 1, len(mapped))
+        return [pos for pos in automaton.finditer_range(mapped, start, scan_end) if pos < end]
+
+
+
+def shard_bounds(size : uint, shards : uint) -> list[tuple[uint, uint]]:
+    shards = max(1, min(shards, size))
+    step : uint = -(-size // shards)
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+
+def mmap_search(path : str, pattern : Symbols, shards : uint = 1, workers : Optional[int] = None) -> list[uint]:
+    if isinstance(pattern, str):
+        pattern = pattern.encode("utf-8")
+    if len(pattern) == 0:
+        raise ValueError("Шаблон не может быть пустым")
+    size : uint = os.path.getsize(path)
+    if size < len(pattern):
+        return []
+
+    bounds : list[tuple[uint, uint]] = shard_bounds(size, shards)
+    if len(bounds) == 1:
+        return _search_mmap_shard(path, pattern, 0, size)
+
+    with ProcessPoolExecutor(workers) as pool:
+        parts = pool.map(_search_mmap_shard, [path] * len(bounds), [pattern] * len(bounds),
+                         [start for start, _ in bounds], [end for _, end in bounds])
+        return [pos for part in parts for pos in part]
+
+
+
+def _search_shared_segment(name : str, pattern : bytes, start : uint, end : uint, size : uint, unit : uint) -> list[uint]:
+    shared : SharedMemory = SharedMemory(name=name)
+    try:
+        view : memoryview = shared.buf[:size]
+        scan_end : uint = min(end + len(pattern) - unit, size)
+        found : list[uint] = [pos // unit for pos in KMPAutomaton(pattern).finditer_range(view, start, scan_end)
+                              if pos < end and pos % unit == 0]
+        view.release()
+        return found
+    finally:
+        shared.close()
+
+
+
+def parallel_search(text : Symbols, pattern : Symbols, segments : Optional[int] = None, workers : Optional[int] = None) -> list[uint]:
+    if not KMP._validate_data(text, pattern):
+        return []
+    unit : uint = 1 if isinstance(text, (bytes, bytearray)) else 4
+    data : bytes = text if unit == 1 else text.encode("utf-32-le")
+    needle : bytes = pattern if unit == 1 else pattern.encode("utf-32-le")
+    workers = workers or os.cpu_count() or 1
+    bounds : list[tuple[uint, uint]] = [(start * unit, end * unit) for start, end in shard_bounds(len(text), segments or workers)]
+    if len(bounds) == 1:
+        return KMPAutomaton(needle).findall(data) if unit == 1 else compile_pattern(pattern).findall(text)
+
+    shared : SharedMemory = SharedMemory(create=True, size=len(data))
+    try:
+        shared.buf[:len(data)] = data
+        with ProcessPoolExecutor(workers) as pool:
+            parts = pool.map(_search_shared_segment, [shared.name] * len(bounds), [needle] * len(bounds),
+                             [start for start, _ in bounds], [end for _, end in bounds],
+                             [len(data)] * len(bounds), [unit] * len(bounds))
+            return sorted({pos for part in parts for pos in part})
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+
 def main() -> None:
     pattern : str = input("Введите шаблон для поиска: ")
     text : str = input("Введите текст для поиска: ")
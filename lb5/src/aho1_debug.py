@@ -1,12 +1,19 @@
+from array import array
+from bisect import bisect_right
 from collections import deque
+import heapq
+import os
 import sys
-import graphviz
-from typing import List, Tuple, Dict, Optional, Deque
+from concurrent.futures import ProcessPoolExecutor
+from mmap import mmap, ACCESS_READ
+from typing import List, Tuple, Dict, Optional, Deque, Union, Iterable, Iterator
+from compact import ByteAutomaton, CompactAutomaton, CompiledAutomaton, symbol_code
+from dump import DEFAULT_MAX_NODES, render_automaton
 
 DEBUG = True
-VISUALIZE = True
-
-input = sys.stdin.read().split()
+VISUALIZE = False
+STREAM_CHUNK_SIZE = 1 << 16
+MATCH_MODES: Tuple[str, ...] = ('all', 'count', 'first', 'leftmost-longest')
 
 
 
@@ -115,37 +122,265 @@ def search(text: str, nodes: List[AhoNode], patterns: List[str]) -> List[Tuple[i
 
 
 
+def step(nodes: List[AhoNode], current_idx: int, c: Union[str, int]) -> int:
+    while current_idx != 0 and c not in nodes[current_idx].trans:
+        current_idx = nodes[current_idx].fail
+    return nodes[current_idx].trans.get(c, 0)
+
+
+
+def node_depths(nodes: List[AhoNode]) -> List[int]:
+    depths: List[int] = [0] * len(nodes)
+    queue: Deque[int] = deque([0])
+    while queue:
+        current_idx: int = queue.popleft()
+        for child_idx in nodes[current_idx].trans.values():
+            depths[child_idx] = depths[current_idx] + 1
+            queue.append(child_idx)
+    return depths
+
+
+
+def count_matches(text: Union[str, bytes], nodes: List[AhoNode], patterns: List[Union[str, bytes]]) -> array:
+    counts: array = array('Q', [0]) * len(patterns)
+    current_idx: int = 0
+    for c in text:
+        current_idx = step(nodes, current_idx, c)
+        temp_idx: int = current_idx
+        while temp_idx != 0:
+            for p_num in nodes[temp_idx].outputs:
+                counts[p_num - 1] += 1
+            temp_idx = nodes[temp_idx].terminal if nodes[temp_idx].terminal != -1 else 0
+    debug_print(f"\nНайдено вхождений: {sum(counts)}")
+    return counts
+
+
+
+def first_match(text: Union[str, bytes], nodes: List[AhoNode], patterns: List[Union[str, bytes]]) -> Optional[Tuple[int, int]]:
+    current_idx: int = 0
+    for pos, c in enumerate(text, 1):
+        current_idx = step(nodes, current_idx, c)
+        match_idx: int = current_idx if nodes[current_idx].outputs else max(nodes[current_idx].terminal, 0)
+        if match_idx != 0:
+            p_num: int = nodes[match_idx].outputs[0]
+            debug_print(f"\nПервое вхождение: шаблон {p_num}, конец на позиции {pos}")
+            return pos - len(patterns[p_num - 1]) + 1, p_num
+    return None
+
+
+
+def leftmost_longest(text: Union[str, bytes], nodes: List[AhoNode], patterns: List[Union[str, bytes]]) -> List[Tuple[int, int]]:
+    depths: List[int] = node_depths(nodes)
+    matches: List[Tuple[int, int]] = []
+    best: Optional[Tuple[int, int, int]] = None
+    current_idx: int = 0
+    pos: int = 0
+    while pos < len(text) or best is not None:
+        if pos < len(text):
+            current_idx = step(nodes, current_idx, text[pos])
+        # Все будущие совпадения начинаются не левее начала текущего состояния
+        if best is not None and (pos == len(text) or best[0] < pos - depths[current_idx] + 1):
+            matches.append((best[0] + 1, best[2]))
+            pos = best[1] + 1
+            best = None
+            current_idx = 0
+            continue
+        match_idx: int = current_idx if nodes[current_idx].outputs else max(nodes[current_idx].terminal, 0)
+        if match_idx != 0:
+            start: int = pos - depths[match_idx] + 1
+            if best is None or start <= best[0]:
+                best = (start, pos, nodes[match_idx].outputs[0])
+        pos += 1
+    debug_print(f"\nНепересекающихся вхождений: {len(matches)}")
+    return matches
+
+
+
+def search_with_mode(text: Union[str, bytes], nodes: List[AhoNode], patterns: List[Union[str, bytes]],
+                     mode: str = 'all') -> Union[List[Tuple[int, int]], array, Optional[Tuple[int, int]]]:
+    if mode == 'all':
+        return search(text, nodes, patterns)
+    if mode == 'count':
+        return count_matches(text, nodes, patterns)
+    if mode == 'first':
+        return first_match(text, nodes, patterns)
+    if mode == 'leftmost-longest':
+        return leftmost_longest(text, nodes, patterns)
+    raise ValueError(f"Неизвестный режим поиска '{mode}', допустимые: {', '.join(MATCH_MODES)}")
+
+
+
+def search_compact(text: Union[str, bytes], automaton: CompactAutomaton) -> List[Tuple[int, int]]:
+    debug_print(f"\nПоиск по компактному автомату ({automaton.size} узлов, {automaton.nbytes} байт)")
+    lengths = automaton.pattern_lengths
+    current_idx: int = 0
+    occurrences: List[Tuple[int, int]] = []
+    for pos, c in enumerate(text, 1):
+        current_idx = automaton.next_state(current_idx, symbol_code(c))
+        for pattern_idx in automaton.iter_outputs(current_idx):
+            occurrences.append((pos - lengths[pattern_idx] + 1, pattern_idx + 1))
+    return sorted(occurrences)
+
+
+
+def search_dfa(text: Union[str, bytes], dfa: CompiledAutomaton) -> List[Tuple[int, int]]:
+    debug_print(f"\nПоиск по DFA ({dfa.size} состояний, {dfa.columns} столбцов, {dfa.nbytes} байт)")
+    table = dfa.table
+    width: int = dfa.columns
+    output_start = dfa.output_start
+    output_ids = dfa.output_ids
+    lengths = dfa.pattern_lengths
+    columns: Dict[Union[str, int], int] = {}
+    state: int = 0
+    occurrences: List[Tuple[int, int]] = []
+    for pos, c in enumerate(text, 1):
+        column: Optional[int] = columns.get(c)
+        if column is None:
+            column = columns[c] = dfa.column(symbol_code(c))
+        state = table[state * width + column] if column >= 0 else 0
+        for k in range(output_start[state], output_start[state + 1]):
+            pattern_idx: int = output_ids[k]
+            occurrences.append((pos - lengths[pattern_idx] + 1, pattern_idx + 1))
+    return sorted(occurrences)
+
+
+
+class StreamScanner:
+    def __init__(self, nodes: List[AhoNode], patterns: List[Union[str, bytes]]) -> None:
+        self.nodes: List[AhoNode] = nodes
+        self.lengths: List[int] = [len(p) for p in patterns]
+        self.max_length: int = max(self.lengths, default=1)
+        self.state: int = 0
+        self.offset: int = 0
+        self.pending: List[Tuple[int, int]] = []
+
+    def reset(self) -> None:
+        self.state = 0
+        self.offset = 0
+        self.pending = []
+
+    def feed(self, chunk: Union[str, bytes]) -> List[Tuple[int, int]]:
+        debug_print(f"\nПорция из {len(chunk)} символов, смещение {self.offset}")
+        nodes: List[AhoNode] = self.nodes
+        lengths: List[int] = self.lengths
+        pending: List[Tuple[int, int]] = self.pending
+        ready: List[Tuple[int, int]] = []
+        current_idx: int = self.state
+        for pos, c in enumerate(chunk, self.offset + 1):
+            while current_idx != 0 and c not in nodes[current_idx].trans:
+                current_idx = nodes[current_idx].fail
+            current_idx = nodes[current_idx].trans.get(c, 0)
+
+            temp_idx: int = current_idx
+            while temp_idx != 0:
+                for p_num in nodes[temp_idx].outputs:
+                    heapq.heappush(pending, (pos - lengths[p_num - 1] + 1, p_num))
+                temp_idx = nodes[temp_idx].terminal if nodes[temp_idx].terminal != -1 else 0
+
+            # Совпадения, которые ещё могут начаться раньше, заканчиваются не раньше pos + 1
+            while pending and pending[0][0] <= pos + 1 - self.max_length:
+                ready.append(heapq.heappop(pending))
+        self.state = current_idx
+        self.offset += len(chunk)
+        return ready
+
+    def close(self) -> List[Tuple[int, int]]:
+        return [heapq.heappop(self.pending) for _ in range(len(self.pending))]
+
+    def scan(self, chunks: Iterable[Union[str, bytes]]) -> Iterator[Tuple[int, int]]:
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.close()
+
+
+
+def iter_chunks(source: Union[Iterable[Union[str, bytes]], object], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Union[str, bytes]]:
+    if not hasattr(source, 'read'):
+        yield from source
+        return
+    while True:
+        chunk: Union[str, bytes] = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+
+def scan_stream(source: Union[Iterable[Union[str, bytes]], object], patterns: List[Union[str, bytes]],
+                chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Tuple[int, int]]:
+    scanner = StreamScanner(build_automaton(patterns), patterns)
+    yield from scanner.scan(iter_chunks(source, chunk_size))
+
+
+
+def search_bytes(text: Union[str, bytes], automaton: ByteAutomaton) -> List[Tuple[int, int]]:
+    debug_print(f"\nПоиск по байтовому DFA ({automaton.dfa.size} состояний, {automaton.columns} столбцов)")
+    codes: bytes = automaton.encode(text)
+    occurrences: List[Tuple[int, int]] = [(start, pattern_idx + 1) for start, pattern_idx in automaton.finditer(codes)]
+    if isinstance(text, str) and not text.isascii():
+        # Байтовые смещения переводятся обратно в номера символов по началам UTF-8 последовательностей
+        raw: bytes = text.encode('utf-8')
+        char_starts: List[int] = [i for i, b in enumerate(raw) if b & 0xC0 != 0x80]
+        occurrences = [(bisect_right(char_starts, start), p_num) for start, p_num in occurrences]
+    else:
+        occurrences = [(start + 1, p_num) for start, p_num in occurrences]
+    return sorted(occurrences)
+
+
+
 def read_input() -> Tuple[str, List[str]]:
+    tokens: List[str] = sys.stdin.read().split()
     ptr: int = 0
-    text: str = input[ptr]
+    text: str = tokens[ptr]
     ptr += 1
-    n: int = int(input[ptr])
+    n: int = int(tokens[ptr])
     ptr += 1
-    patterns: List[str] = [input[ptr + i] for i in range(n)]
+    patterns: List[str] = [tokens[ptr + i] for i in range(n)]
     return text, patterns
 
 
 
-def visualize_automaton(nodes: List[AhoNode], filename: str = 'automaton') -> None:
-    dot = graphviz.Digraph(comment='Aho-Corasick Automaton', format='png')
-    
-    for i, node in enumerate(nodes):
-        label: List[str] = [
-            f'Узел {i}',
-            f'Trans: {node.trans}',
-            f'Fail: {node.fail}',
-            f'Outputs: {node.outputs}'
-        ]
-        label_str: str = '\n'.join(label)
-        dot.node(str(i), label=label_str)
-        
-        for c, target in node.trans.items():
-            dot.edge(str(i), str(target), label=c, color='blue')
-        
-        if node.fail != i:
-            dot.edge(str(i), str(node.fail), label='fail', color='red', style='dashed')
-    
-    dot.render(filename, view=True)
+def shard_bounds(size: int, shards: int) -> List[Tuple[int, int]]:
+    shards = max(1, min(shards, size))
+    step: int = -(-size // shards)
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+
+def search_mmap_shard(path: str, nodes: List[AhoNode], patterns: List[bytes], start: int, end: int) -> List[Tuple[int, int]]:
+    overlap: int = max(len(p) for p in patterns) - 1
+    with open(path, 'rb') as source, mmap(source.fileno(), 0, access=ACCESS_READ) as mapped:
+        view: memoryview = memoryview(mapped)
+        try:
+            scanner = StreamScanner(nodes, patterns)
+            found: List[Tuple[int, int]] = scanner.feed(view[start:min(end + overlap, len(mapped))]) + scanner.close()
+        finally:
+            view.release()
+    return [(start + pos, p_num) for pos, p_num in found if start + pos <= end]
+
+
+
+def search_mmap(path: str, patterns: List[Union[str, bytes]], shards: int = 1, workers: Optional[int] = None) -> List[Tuple[int, int]]:
+    encoded: List[bytes] = [p.encode('utf-8') if isinstance(p, str) else p for p in patterns]
+    nodes: List[AhoNode] = build_automaton(encoded)
+    size: int = os.path.getsize(path)
+    if size == 0 or not encoded:
+        return []
+
+    bounds: List[Tuple[int, int]] = shard_bounds(size, shards)
+    if len(bounds) == 1:
+        return search_mmap_shard(path, nodes, encoded, 0, size)
+
+    with ProcessPoolExecutor(workers) as pool:
+        parts = pool.map(search_mmap_shard, [path] * len(bounds), [nodes] * len(bounds), [encoded] * len(bounds),
+                         [start for start, _ in bounds], [end for _, end in bounds])
+        return sorted(occurrence for part in parts for occurrence in part)
+
+
+
+def visualize_automaton(nodes: List[AhoNode], filename: str = 'automaton', max_nodes: int = DEFAULT_MAX_NODES) -> None:
+    rendered: str = render_automaton(nodes, filename, view=True, max_nodes=max_nodes)
+    debug_print(f"Визуализация сохранена в {rendered}")
 
 
 
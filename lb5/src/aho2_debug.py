@@ -1,10 +1,17 @@
+import heapq
+import os
 import sys
+from array import array
 from collections import deque
-from typing import List, Tuple, Dict, Deque, Optional
-import graphviz
+from concurrent.futures import ProcessPoolExecutor
+from mmap import mmap, ACCESS_READ
+from typing import List, Tuple, Dict, Deque, Optional, Union, Iterable, Iterator
+from compact import CompactAutomaton, CompiledAutomaton, symbol_code
+from dump import DEFAULT_MAX_NODES, render_automaton
 
 DEBUG = True
-VISUALIZE = True
+VISUALIZE = False
+AUTOMATON_KINDS: Tuple[str, ...] = ('nodes', 'compact', 'dfa')
 
 
 
@@ -74,28 +81,10 @@ def build_automaton(patterns: List[str]) -> List[AhoNode]:
 
 
 
-def visualize_automaton(nodes: List[AhoNode], filename: str = 'automaton') -> None:
+def visualize_automaton(nodes: List[AhoNode], filename: str = 'automaton', max_nodes: int = DEFAULT_MAX_NODES) -> None:
     debug_print("\nГенерация визуализации автомата...")
-    dot = graphviz.Digraph(comment='Aho-Corasick Automaton', format='png')
-    
-    for i, node in enumerate(nodes):
-        label: List[str] = [
-            f'Узел {i}',
-            f'Переходы: {node.trans}',
-            f'Fail: {node.fail}',
-            f'Выходы: {node.outputs}',
-            f'Terminal: {node.terminal}'
-        ]
-        dot.node(str(i), '\n'.join(label))
-        
-        for c, target in node.trans.items():
-            dot.edge(str(i), str(target), label=c, color='blue')
-        
-        if node.fail != i and node.fail != 0:
-            dot.edge(str(i), str(node.fail), label='fail', color='red', style='dashed')
-    
-    dot.render(filename, view=True)
-    debug_print(f"Визуализация сохранена в {filename}.png")
+    rendered: str = render_automaton(nodes, filename, view=True, max_nodes=max_nodes)
+    debug_print(f"Визуализация сохранена в {rendered}")
 
 
 
@@ -126,52 +115,208 @@ def split_pattern(pattern: str, wildcard: str) -> List[Tuple[str, int]]:
 
 
 
-def find_occurrences(text: str, automaton: List[AhoNode], pattern_info: List[Tuple[str, int]], parts: List[Tuple[str, int]]) -> List[int]:
-    debug_print(f"\nПоиск в тексте длиной {len(text)} символов...")
-    current: AhoNode = automaton[0]
-    occurrences: List[int] = []
-    
-    for pos, c in enumerate(text):
-        while True:
-            if c in current.trans:
-                child_idx: int = current.trans[c]
-                current = automaton[child_idx]
-                debug_print(f"  Символ '{c}' на позиции {pos}: переход в узел {child_idx}")
-                break
-            elif current == automaton[0]:
-                debug_print(f"  Символ '{c}' на позиции {pos}: остаемся в корне")
-                break
-            else:
-                prev_fail: int = current.fail
-                current = automaton[current.fail]
-                debug_print(f"  Переход по fail из {prev_fail} в узел {current.fail}")
-        
-        temp: AhoNode = current
-        while temp != automaton[0]:
-            for pid in temp.outputs:
-                pattern, start_in_pat = pattern_info[pid]
-                start: int = pos - len(pattern) + 1 - start_in_pat
+class SegmentMatcher:
+    def __init__(self, segments: List[Union[str, bytes]], kind: str = 'nodes') -> None:
+        if kind not in AUTOMATON_KINDS:
+            raise ValueError(f"Неизвестный вид автомата '{kind}', допустимые: {', '.join(AUTOMATON_KINDS)}")
+        self.kind: str = kind
+        self.nodes: List[AhoNode] = build_automaton(segments) if kind == 'nodes' else []
+        self.automaton: Optional[CompactAutomaton] = CompactAutomaton(segments) if kind != 'nodes' else None
+        self.dfa: Optional[CompiledAutomaton] = CompiledAutomaton(self.automaton) if kind == 'dfa' else None
+        self.columns: Dict[Union[str, int], int] = {}
+
+    def step(self, state: int, c: Union[str, int]) -> int:
+        if self.dfa is not None:
+            column: Optional[int] = self.columns.get(c)
+            if column is None:
+                column = self.columns[c] = self.dfa.column(symbol_code(c))
+            return self.dfa.table[state * self.dfa.columns + column] if column >= 0 else 0
+        if self.automaton is not None:
+            return self.automaton.next_state(state, symbol_code(c))
+        nodes: List[AhoNode] = self.nodes
+        while state != 0 and c not in nodes[state].trans:
+            state = nodes[state].fail
+        return nodes[state].trans.get(c, 0)
+
+    def outputs(self, state: int) -> Iterator[int]:
+        if self.dfa is not None:
+            return self.dfa.iter_outputs(state)
+        if self.automaton is not None:
+            return self.automaton.iter_outputs(state)
+        return self._node_outputs(state)
+
+    def _node_outputs(self, state: int) -> Iterator[int]:
+        nodes: List[AhoNode] = self.nodes
+        while state != 0:
+            yield from nodes[state].outputs
+            state = nodes[state].terminal if nodes[state].terminal != -1 else 0
+
+
+
+class WildcardScanner:
+    def __init__(self, pattern_info: List[Tuple[Union[str, bytes], int]], pattern_len: int, kind: str = 'nodes') -> None:
+        self.pattern_info: List[Tuple[Union[str, bytes], int]] = pattern_info
+        self.pattern_len: int = pattern_len
+        self.target_count: int = len(pattern_info)
+        self.matcher: SegmentMatcher = SegmentMatcher([part for part, _ in pattern_info], kind)
+        self.shifts: List[int] = [len(part) - 1 + start_in_pat for part, start_in_pat in pattern_info]
+        self.counts: array = array('I', [0]) * pattern_len
+        self.state: int = 0
+        self.offset: int = 0
+
+    def reset(self) -> None:
+        self.counts = array('I', [0]) * self.pattern_len
+        self.state = 0
+        self.offset = 0
+
+    def feed(self, chunk: Union[str, bytes]) -> List[int]:
+        debug_print(f"\nПорция из {len(chunk)} символов, смещение {self.offset}")
+        step = self.matcher.step
+        outputs = self.matcher.outputs
+        shifts: List[int] = self.shifts
+        counts: array = self.counts
+        window: int = self.pattern_len
+        target_count: int = self.target_count
+        current_idx: int = self.state
+        ready: List[int] = []
+        for pos, c in enumerate(chunk, self.offset):
+            current_idx = step(current_idx, c)
+            for pid in outputs(current_idx):
+                start: int = pos - shifts[pid]
                 if start >= 0:
-                    debug_print(f"  Найдено совпадение сегмента {pid} ('{pattern}') на позиции {start}")
-                    occurrences.append(start)
-            temp = automaton[temp.terminal] if temp.terminal != -1 else automaton[0]
-    
-    debug_print(f"Всего предварительных совпадений: {len(occurrences)}")
-    return occurrences
-
+                    counts[start % window] += 1
+
+            # Позиция pos - window + 1 больше не получит совпадений: окно шаблона прошло её целиком
+            done: int = pos - window + 1
+            if done >= 0:
+                slot: int = done % window
+                if counts[slot] == target_count:
+                    ready.append(done + 1)
+                counts[slot] = 0
+        self.state = current_idx
+        self.offset += len(chunk)
+        return ready
+
+    def scan(self, chunks: Iterable[Union[str, bytes]]) -> Iterator[int]:
+        for chunk in chunks:
+            yield from self.feed(chunk)
+
+
+
+class MultiWildcardScanner:
+    def __init__(self, patterns: List[str], wildcard: str, kind: str = 'nodes') -> None:
+        self.patterns: List[str] = patterns
+        self.pattern_lens: List[int] = [len(pattern) for pattern in patterns]
+        self.target_counts: List[int] = []
+        self.bases: List[int] = []
+        segment_ids: Dict[str, int] = {}
+        self.segment_targets: List[List[Tuple[int, int]]] = []
+        window_total: int = 0
+        for pattern_id, pattern in enumerate(patterns):
+            parts: List[Tuple[str, int]] = split_pattern(pattern, wildcard)
+            self.target_counts.append(len(parts))
+            self.bases.append(window_total)
+            window_total += len(pattern)
+            for part, start_in_pat in parts:
+                if part not in segment_ids:
+                    segment_ids[part] = len(segment_ids)
+                    self.segment_targets.append([])
+                self.segment_targets[segment_ids[part]].append((pattern_id, len(part) - 1 + start_in_pat))
+        debug_print(f"Шаблонов: {len(patterns)}, уникальных сегментов: {len(segment_ids)}")
+        self.matcher: SegmentMatcher = SegmentMatcher(list(segment_ids), kind)
+        self.counts: array = array('I', [0]) * window_total
+        self.stamps: array = array('q', [-1]) * window_total
+        self.pending: List[Tuple[int, int, int]] = []
+        self.state: int = 0
+        self.offset: int = 0
+
+    def feed(self, chunk: Union[str, bytes]) -> List[Tuple[int, int]]:
+        debug_print(f"\nПорция из {len(chunk)} символов, смещение {self.offset}")
+        step = self.matcher.step
+        outputs = self.matcher.outputs
+        segment_targets: List[List[Tuple[int, int]]] = self.segment_targets
+        pattern_lens: List[int] = self.pattern_lens
+        target_counts: List[int] = self.target_counts
+        bases: List[int] = self.bases
+        counts: array = self.counts
+        stamps: array = self.stamps
+        pending: List[Tuple[int, int, int]] = self.pending
+        current_idx: int = self.state
+        ready: List[Tuple[int, int]] = []
+        for pos, c in enumerate(chunk, self.offset):
+            current_idx = step(current_idx, c)
+            for sid in outputs(current_idx):
+                for pattern_id, shift in segment_targets[sid]:
+                    start: int = pos - shift
+                    if start < 0:
+                        continue
+                    slot: int = bases[pattern_id] + start % pattern_lens[pattern_id]
+                    # Ячейка кольца переиспользуется: сбрасываем, если она осталась от прежнего начала
+                    if stamps[slot] != start:
+                        stamps[slot] = start
+                        counts[slot] = 0
+                    counts[slot] += 1
+                    if counts[slot] == target_counts[pattern_id]:
+                        heapq.heappush(pending, (start + pattern_lens[pattern_id] - 1, start, pattern_id))
+
+            while pending and pending[0][0] <= pos:
+                _, start, pattern_id = heapq.heappop(pending)
+                ready.append((start + 1, pattern_id + 1))
+        self.state = current_idx
+        self.offset += len(chunk)
+        return ready
+
+    def scan(self, chunks: Iterable[Union[str, bytes]]) -> Iterator[Tuple[int, int]]:
+        for chunk in chunks:
+            yield from self.feed(chunk)
+
+
+
+def search_wildcard_patterns(text: Union[str, bytes], patterns: List[str], wildcard: str,
+                             kind: str = 'nodes') -> List[Tuple[int, int]]:
+    return sorted(MultiWildcardScanner(patterns, wildcard, kind).feed(text))
+
+
+
+def shard_bounds(size: int, shards: int) -> List[Tuple[int, int]]:
+    shards = max(1, min(shards, size))
+    step: int = -(-size // shards)
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+
+def search_mmap_shard(path: str, pattern_info: List[Tuple[bytes, int]], pattern_len: int, start: int, end: int) -> List[int]:
+    with open(path, 'rb') as source, mmap(source.fileno(), 0, access=ACCESS_READ) as mapped:
+        last_start: int = min(end, len(mapped) - pattern_len + 1)
+        if last_start <= start:
+            return []
+        view: memoryview = memoryview(mapped)
+        try:
+            scanner = WildcardScanner(pattern_info, pattern_len)
+            return [start + pos for pos in scanner.feed(view[start:last_start + pattern_len - 1])]
+        finally:
+            view.release()
+
+
+
+def search_mmap(path: str, pattern: str, wildcard: str, shards: int = 1, workers: Optional[int] = None) -> List[int]:
+    raw: str = pattern.encode('utf-8').decode('latin-1')
+    wildcard_byte: str = wildcard.encode('utf-8').decode('latin-1')
+    if len(wildcard_byte) != 1:
+        raise ValueError("Джокер должен кодироваться одним байтом")
+    pattern_info: List[Tuple[bytes, int]] = [(part.encode('latin-1'), pos) for part, pos in split_pattern(raw, wildcard_byte)]
+    size: int = os.path.getsize(path)
+    if not pattern_info or size < len(raw):
+        return []
 
+    bounds: List[Tuple[int, int]] = shard_bounds(size, shards)
+    if len(bounds) == 1:
+        return search_mmap_shard(path, pattern_info, len(raw), 0, size)
 
-def process_results(occurrences: List[int], text: str, pattern_len: int, target_count: int) -> List[int]:
-    max_start: int = len(text) - pattern_len
-    if max_start < 0:
-        return []
-    
-    counter: List[int] = [0] * (max_start + 1)
-    for start in occurrences:
-        if 0 <= start <= max_start:
-            counter[start] += 1
-    
-    return [i + 1 for i in range(max_start + 1) if counter[i] == target_count]
+    with ProcessPoolExecutor(workers) as pool:
+        parts = pool.map(search_mmap_shard, [path] * len(bounds), [pattern_info] * len(bounds),
+                         [len(raw)] * len(bounds), [start for start, _ in bounds], [end for _, end in bounds])
+        return [pos for part in parts for pos in part]
 
 
 
@@ -191,14 +336,6 @@ def prepare_patterns(pattern: str, wildcard: str) -> Tuple[List[str], List[Tuple
 
 
 
-def execute_search(text: str, patterns: List[str], pattern_info: List[Tuple[str, int]], parts: List[Tuple[str, int]]) -> List[int]:
-    automaton = build_automaton(patterns)
-    if VISUALIZE:
-        visualize_automaton(automaton)
-    return find_occurrences(text, automaton, pattern_info, parts)
-
-
-
 def print_results(results: List[int]) -> None:
     if results:
         print('\n'.join(map(str, sorted(results))))
@@ -215,9 +352,10 @@ def main() -> None:
         print("")
         return
     
-    occurrences = execute_search(text, patterns, pattern_info, split_pattern(pattern, wildcard))
-    results = process_results(occurrences, text, len(pattern), len(patterns))
-    print_results(results)
+    scanner = WildcardScanner(pattern_info, len(pattern))
+    if VISUALIZE:
+        visualize_automaton(scanner.matcher.nodes)
+    print_results(list(scanner.feed(text)))
 
 
 
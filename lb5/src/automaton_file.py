@@ -0,0 +1,124 @@
+import struct
+import sys
+from array import array
+from mmap import mmap, ACCESS_READ
+from typing import Dict, List, Sequence, Tuple, Union
+
+from compact import CompactAutomaton, CompiledAutomaton, Pattern
+
+MAGIC: bytes = b'AHOC'
+FORMAT_VERSION: int = 1
+KIND_COMPACT: int = 0
+KIND_DFA: int = 1
+ALIGNMENT: int = 8
+
+HEADER = struct.Struct('<4sIIIIII')
+COLUMN = struct.Struct('<4sQ')
+
+COMPACT_COLUMNS: Tuple[str, ...] = ('edge_start', 'edge_symbols', 'edge_targets', 'fail', 'terminal',
+                                    'output_start', 'output_ids', 'accepting', 'pattern_lengths')
+DFA_COLUMNS: Tuple[str, ...] = ('table', 'output_start', 'output_ids', 'pattern_lengths', 'alphabet')
+PATTERN_COLUMNS: Tuple[str, ...] = ('pattern_offsets', 'pattern_blob')
+
+Automaton = Union[CompactAutomaton, CompiledAutomaton]
+
+
+
+class PatternTable:
+    def __init__(self, offsets: Sequence[int], blob: memoryview, text_mode: bool) -> None:
+        self._offsets: Sequence[int] = offsets
+        self._blob: memoryview = blob
+        self._text_mode: bool = text_mode
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> Pattern:
+        raw: bytes = bytes(self._blob[self._offsets[index]:self._offsets[index + 1]])
+        return raw.decode('utf-8') if self._text_mode else raw
+
+
+
+def _pattern_columns(patterns: Sequence[Pattern]) -> Tuple[bool, array, array]:
+    text_mode: bool = any(isinstance(p, str) for p in patterns)
+    offsets: array = array('Q', [0])
+    blob: array = array('B')
+    for pattern in patterns:
+        blob.frombytes(pattern.encode('utf-8') if text_mode else bytes(pattern))
+        offsets.append(len(blob))
+    return text_mode, offsets, blob
+
+
+
+def save_automaton(automaton: Automaton, path: str) -> None:
+    if sys.byteorder != 'little':
+        raise ValueError("Формат автомата рассчитан на little-endian платформы")
+    text_mode, offsets, blob = _pattern_columns(automaton.patterns)
+    if isinstance(automaton, CompiledAutomaton):
+        kind: int = KIND_DFA
+        alphabet: array = array('I', sorted(automaton.symbol_column)) if not automaton.byte_mode else array('I')
+        columns: List[array] = [automaton.table, automaton.output_start, automaton.output_ids,
+                                automaton.pattern_lengths, alphabet]
+        width: int = automaton.columns
+        byte_mode: int = int(automaton.byte_mode)
+    else:
+        kind = KIND_COMPACT
+        columns = [getattr(automaton, name) for name in COMPACT_COLUMNS]
+        width = 0
+        byte_mode = 0
+    columns += [offsets, blob]
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, kind, int(text_mode), width, byte_mode, len(columns)))
+        for column in columns:
+            f.write(COLUMN.pack(column.typecode.encode('ascii').ljust(4, b'\0'), len(column)))
+        for column in columns:
+            f.write(b'\0' * (-f.tell() % ALIGNMENT))
+            column.tofile(f)
+
+
+
+def load_automaton(path: str) -> Automaton:
+    with open(path, 'rb') as f:
+        mapped: mmap = mmap(f.fileno(), 0, access=ACCESS_READ)
+    view: memoryview = memoryview(mapped)
+
+    magic, version, kind, text_mode, width, byte_mode, count = HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: не файл автомата Ахо-Корасик")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path}: версия формата {version}, ожидалась {FORMAT_VERSION}")
+
+    position: int = HEADER.size
+    shapes: List[Tuple[str, int]] = []
+    for _ in range(count):
+        typecode, length = COLUMN.unpack_from(mapped, position)
+        shapes.append((typecode.rstrip(b'\0').decode('ascii'), length))
+        position += COLUMN.size
+
+    columns: List[memoryview] = []
+    for typecode, length in shapes:
+        position += -position % ALIGNMENT
+        itemsize: int = array(typecode).itemsize
+        columns.append(view[position:position + itemsize * length].cast(typecode))
+        position += itemsize * length
+
+    names: Tuple[str, ...] = (DFA_COLUMNS if kind == KIND_DFA else COMPACT_COLUMNS) + PATTERN_COLUMNS
+    fields: Dict[str, memoryview] = dict(zip(names, columns))
+
+    automaton: Automaton
+    if kind == KIND_DFA:
+        automaton = CompiledAutomaton.__new__(CompiledAutomaton)
+        automaton.columns = width
+        automaton.byte_mode = bool(byte_mode)
+        codes = fields.pop('alphabet')
+        automaton.symbol_column = ({code: code for code in range(width)} if automaton.byte_mode
+                                   else {code: column for column, code in enumerate(codes, 1)})
+    else:
+        automaton = CompactAutomaton.__new__(CompactAutomaton)
+    for name in names:
+        if name in fields and name not in PATTERN_COLUMNS:
+            setattr(automaton, name, fields[name])
+    automaton.patterns = PatternTable(fields['pattern_offsets'], fields['pattern_blob'], bool(text_mode))
+    automaton.mapped = mapped
+    return automaton
@@ -0,0 +1,165 @@
+import os
+import random
+import tempfile
+import tracemalloc
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+import aho1_debug
+import aho2_debug
+from automaton_file import load_automaton, save_automaton
+from bulk import bulk_build
+from compact import ByteAutomaton, CompactAutomaton, CompiledAutomaton
+
+PATTERN_COUNTS: Tuple[int, ...] = (1000, 10000, 100000)
+TEXT_LENGTH: int = 200000
+ALPHABET: str = 'abcdefghij'
+
+
+
+def random_words(count: int, min_len: int = 3, max_len: int = 12) -> List[str]:
+    return [''.join(random.choice(ALPHABET) for _ in range(random.randint(min_len, max_len))) for _ in range(count)]
+
+
+
+def measure(build: Callable[[], object]) -> Tuple[object, float, int]:
+    tracemalloc.start()
+    time_start: float = perf_counter()
+    result: object = build()
+    elapsed: float = perf_counter() - time_start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+
+def bench_compact_automaton() -> List[Dict[str, object]]:
+    aho1_debug.DEBUG = False
+    aho2_debug.DEBUG = False
+    random.seed(0)
+    text: str = ''.join(random.choice(ALPHABET) for _ in range(TEXT_LENGTH))
+    rows: List[Dict[str, object]] = []
+
+    for count in PATTERN_COUNTS:
+        patterns: List[str] = random_words(count)
+        nodes, node_time, node_peak = measure(lambda: aho1_debug.build_automaton(patterns))
+        compact, compact_time, compact_peak = measure(lambda: CompactAutomaton(patterns))
+        dfa, dfa_time, dfa_peak = measure(lambda: CompiledAutomaton(compact))
+
+        time_start: float = perf_counter()
+        expected = aho1_debug.search(text, nodes, patterns)
+        node_search: float = perf_counter() - time_start
+        time_start = perf_counter()
+        found = aho1_debug.search_compact(text, compact)
+        compact_search: float = perf_counter() - time_start
+        time_start = perf_counter()
+        found_dfa = aho1_debug.search_dfa(text, dfa)
+        dfa_search: float = perf_counter() - time_start
+        byte_automaton = ByteAutomaton(patterns)
+        time_start = perf_counter()
+        found_bytes = aho1_debug.search_bytes(text, byte_automaton)
+        byte_search: float = perf_counter() - time_start
+        assert found == found_dfa == found_bytes == expected
+
+        rows.append({
+            'Шаблонов': count,
+            'Узлов': compact.size,
+            'AhoNode сборка, с': round(node_time, 3),
+            'AhoNode память, МБ': round(node_peak / 2**20, 1),
+            'Компактный сборка, с': round(compact_time, 3),
+            'Компактный память, МБ': round(compact_peak / 2**20, 1),
+            'Компактный массивы, МБ': round(compact.nbytes / 2**20, 1),
+            'AhoNode поиск, с': round(node_search, 3),
+            'Компактный поиск, с': round(compact_search, 3),
+            'DFA сборка, с': round(dfa_time, 3),
+            'DFA память, МБ': round(dfa_peak / 2**20, 1),
+            'DFA поиск, с': round(dfa_search, 3),
+            'Байтовый DFA поиск, с': round(byte_search, 3),
+        })
+    return rows
+
+
+
+def bench_automaton_file() -> List[Dict[str, object]]:
+    random.seed(0)
+    text: str = ''.join(random.choice(ALPHABET) for _ in range(TEXT_LENGTH))
+    rows: List[Dict[str, object]] = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for count in PATTERN_COUNTS:
+            patterns: List[str] = random_words(count)
+            time_start: float = perf_counter()
+            dfa = CompiledAutomaton(CompactAutomaton(patterns))
+            build_time: float = perf_counter() - time_start
+            path: str = os.path.join(directory, f'{count}.aho')
+            save_automaton(dfa, path)
+            time_start = perf_counter()
+            loaded = load_automaton(path)
+            load_time: float = perf_counter() - time_start
+            assert aho1_debug.search_dfa(text, loaded) == aho1_debug.search_dfa(text, dfa)
+
+            rows.append({
+                'Шаблонов': count,
+                'Сборка, с': round(build_time, 3),
+                'Загрузка, мс': round(load_time * 1000, 3),
+                'Файл, МБ': round(os.path.getsize(path) / 2**20, 1),
+            })
+    return rows
+
+
+
+def bench_bulk_build() -> List[Dict[str, object]]:
+    aho1_debug.DEBUG = False
+    random.seed(0)
+    shards: int = os.cpu_count() or 1
+    rows: List[Dict[str, object]] = []
+
+    for count in PATTERN_COUNTS:
+        patterns: List[str] = random_words(count)
+        time_start: float = perf_counter()
+        aho1_debug.build_automaton(patterns)
+        node_time: float = perf_counter() - time_start
+        time_start = perf_counter()
+        compact = CompactAutomaton(patterns)
+        compact_time: float = perf_counter() - time_start
+        time_start = perf_counter()
+        bulk = bulk_build(patterns)
+        bulk_time: float = perf_counter() - time_start
+        time_start = perf_counter()
+        sharded = bulk_build(patterns, shards=shards)
+        sharded_time: float = perf_counter() - time_start
+        assert bulk.fail == sharded.fail == compact.fail and bulk.terminal == compact.terminal
+
+        rows.append({
+            'Шаблонов': count,
+            'build_automaton, с': round(node_time, 3),
+            'CompactAutomaton, с': round(compact_time, 3),
+            'bulk_build, с': round(bulk_time, 3),
+            f'bulk_build x{shards}, с': round(sharded_time, 3),
+        })
+    return rows
+
+
+
+def print_rows(rows: List[Dict[str, object]]) -> None:
+    if not rows:
+        return
+    headers: List[str] = list(rows[0])
+    widths: List[int] = [max(len(h), *(len(str(row[h])) for row in rows)) for h in headers]
+    print(' | '.join(h.ljust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print(' | '.join(str(row[h]).ljust(w) for h, w in zip(headers, widths)))
+
+
+
+def main() -> None:
+    print_rows(bench_compact_automaton())
+    print()
+    print_rows(bench_automaton_file())
+    print()
+    print_rows(bench_bulk_build())
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from compact import CompactAutomaton, Pattern, symbol_code
+
+Shard = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+COLUMN_TYPES: Dict[str, type] = {'I': np.uint32, 'i': np.int32, 'B': np.uint8}
+
+
+
+def _build_shard(entries: List[Tuple[Pattern, int]]) -> Shard:
+    depth: List[int] = []
+    parent: List[int] = []
+    codes: List[int] = []
+    output_start: List[int] = [0]
+    output_ids: List[int] = []
+    queue: Deque[Tuple[int, int, int]] = deque([(0, len(entries), 0)])
+    node: int = 0
+
+    while queue:
+        lo, hi, level = queue.popleft()
+        if node:
+            while lo < hi and len(entries[lo][0]) == level:
+                output_ids.append(entries[lo][1])
+                lo += 1
+            output_start.append(len(output_ids))
+        while lo < hi:
+            code: int = symbol_code(entries[lo][0][level])
+            group_end: int = lo + 1
+            while group_end < hi and symbol_code(entries[group_end][0][level]) == code:
+                group_end += 1
+            depth.append(level + 1)
+            parent.append(node)
+            codes.append(code)
+            queue.append((lo, group_end, level + 1))
+            lo = group_end
+        node += 1
+
+    return (np.array(depth, dtype=np.int64), np.array(parent, dtype=np.int64), np.array(codes, dtype=np.int64),
+            np.array(output_start, dtype=np.int64), np.array(output_ids, dtype=np.int64))
+
+
+
+def shard_by_first_symbol(entries: List[Tuple[Pattern, int]], shards: int) -> List[List[Tuple[Pattern, int]]]:
+    groups: List[List[Tuple[Pattern, int]]] = []
+    target: int = -(-len(entries) // max(1, shards))
+    lo: int = 0
+    while lo < len(entries):
+        hi: int = min(lo + target, len(entries))
+        first = entries[hi - 1][0][0]
+        while hi < len(entries) and entries[hi][0][0] == first:
+            hi += 1
+        groups.append(entries[lo:hi])
+        lo = hi
+    return groups
+
+
+
+def _merge_shards(shards: List[Shard]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[int]]:
+    global_ids: List[np.ndarray] = [np.zeros(len(depth) + 1, dtype=np.int64) for depth, _, _, _, _ in shards]
+    max_depth: int = max((int(depth[-1]) for depth, _, _, _, _ in shards if len(depth)), default=0)
+    parents: List[np.ndarray] = []
+    codes: List[np.ndarray] = []
+    counts: List[np.ndarray] = []
+    outputs: List[np.ndarray] = []
+    level_ends: List[int] = []
+    size: int = 1
+
+    for level in range(1, max_depth + 1):
+        for (depth, parent, code, output_start, output_ids), ids in zip(shards, global_ids):
+            lo, hi = np.searchsorted(depth, [level, level + 1])
+            ids[lo + 1:hi + 1] = np.arange(size, size + hi - lo)
+            size += hi - lo
+            parents.append(ids[parent[lo:hi]])
+            codes.append(code[lo:hi])
+            counts.append(np.diff(output_start[lo:hi + 1]))
+            outputs.append(output_ids[output_start[lo]:output_start[hi]])
+        level_ends.append(size - 1)
+
+    def joined(parts: List[np.ndarray]) -> np.ndarray:
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+    return joined(parents), joined(codes), joined(counts), joined(outputs), level_ends
+
+
+
+def _fail_links(parent: np.ndarray, codes: np.ndarray, accepting: np.ndarray, level_ends: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    size: int = len(parent) + 1
+    fail: np.ndarray = np.zeros(size, dtype=np.int64)
+    terminal: np.ndarray = np.full(size, -1, dtype=np.int64)
+    if size == 1:
+        return fail, terminal
+
+    # Рёбра упорядочены по (родитель, символ), поэтому ключи отсортированы и ищутся бинарным поиском
+    radix: int = int(codes.max()) + 1
+    keys: np.ndarray = parent * radix + codes
+    terminal[1:level_ends[0] + 1] = 0 if accepting[0] else -1
+    for lo, hi in zip(level_ends, level_ends[1:]):
+        state: np.ndarray = fail[parent[lo:hi]]
+        code: np.ndarray = codes[lo:hi]
+        result: np.ndarray = np.zeros(hi - lo, dtype=np.int64)
+        pending: np.ndarray = np.arange(hi - lo)
+        while len(pending):
+            probe: np.ndarray = state[pending] * radix + code[pending]
+            k: np.ndarray = np.minimum(np.searchsorted(keys, probe), len(keys) - 1)
+            found: np.ndarray = keys[k] == probe
+            result[pending[found]] = k[found] + 1
+            pending = pending[~found]
+            pending = pending[state[pending] != 0]
+            state[pending] = fail[state[pending]]
+        fail[lo + 1:hi + 1] = result
+        terminal[lo + 1:hi + 1] = np.where(accepting[result] != 0, result, terminal[result])
+    return fail, terminal
+
+
+
+def column(typecode: str, values: np.ndarray) -> array:
+    return array(typecode, values.astype(COLUMN_TYPES[typecode]).tobytes())
+
+
+
+def bulk_build(patterns: Sequence[Pattern], workers: Optional[int] = None, shards: int = 1) -> CompactAutomaton:
+    entries: List[Tuple[Pattern, int]] = sorted((pattern, pid) for pid, pattern in enumerate(patterns))
+    empty: List[int] = [pid for pattern, pid in entries if len(pattern) == 0]
+    groups: List[List[Tuple[Pattern, int]]] = shard_by_first_symbol(entries[len(empty):], shards)
+
+    if len(groups) > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            built: List[Shard] = list(pool.map(_build_shard, groups))
+    else:
+        built = [_build_shard(group) for group in groups]
+    parent, codes, counts, outputs, level_ends = _merge_shards(built)
+
+    size: int = len(parent) + 1
+    output_start: np.ndarray = np.concatenate(([0, len(empty)], len(empty) + np.cumsum(counts)))
+    output_ids: np.ndarray = np.concatenate((np.array(empty, dtype=np.int64), outputs))
+    accepting: np.ndarray = (np.diff(output_start) != 0).astype(np.uint8)
+    edge_start: np.ndarray = np.concatenate(([0], np.cumsum(np.bincount(parent, minlength=size))))
+    fail, terminal = _fail_links(parent, codes, accepting, level_ends)
+
+    automaton: CompactAutomaton = CompactAutomaton.__new__(CompactAutomaton)
+    automaton.patterns = list(patterns)
+    automaton.pattern_lengths = array('I', map(len, automaton.patterns))
+    automaton.edge_start = column('I', edge_start)
+    automaton.edge_symbols = column('I', codes)
+    automaton.edge_targets = column('I', np.arange(1, size))
+    automaton.fail = column('I', fail)
+    automaton.terminal = column('i', terminal)
+    automaton.output_start = column('I', output_start)
+    automaton.output_ids = column('I', output_ids)
+    automaton.accepting = column('B', accepting)
+    return automaton
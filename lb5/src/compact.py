@@ -0,0 +1,202 @@
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Sequence, Tuple, Union
+
+Pattern = Union[str, bytes]
+
+BYTE_ALPHABET_SIZE: int = 256
+
+
+
+def symbol_code(c: Union[str, int]) -> int:
+    return c if isinstance(c, int) else ord(c)
+
+
+
+class CompactAutomaton:
+    def __init__(self, patterns: Sequence[Pattern]) -> None:
+        self.patterns: Sequence[Pattern] = list(patterns)
+        self.pattern_lengths: array = array('I', map(len, self.patterns))
+        self.edge_start: array = array('I', [0])
+        self.edge_symbols: array = array('I')
+        self.edge_targets: array = array('I')
+        self.fail: array = array('I', [0])
+        self.terminal: array = array('i', [-1])
+        self.output_start: array = array('I', [0])
+        self.output_ids: array = array('I')
+        self.accepting: array = array('B', [0])
+        self._build()
+
+    @property
+    def size(self) -> int:
+        return len(self.fail)
+
+    @property
+    def nbytes(self) -> int:
+        columns = (self.edge_start, self.edge_symbols, self.edge_targets, self.fail,
+                   self.terminal, self.output_start, self.output_ids, self.accepting)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def _build(self) -> None:
+        patterns: List[Pattern] = self.patterns
+        order: List[int] = sorted(range(len(patterns)), key=patterns.__getitem__)
+        queue: Deque[Tuple[int, int, int]] = deque([(0, len(order), 0)])
+        node: int = 0
+        if order and len(patterns[order[0]]) == 0:
+            self.accepting[0] = 1
+
+        while queue:
+            lo, hi, depth = queue.popleft()
+            while lo < hi and len(patterns[order[lo]]) == depth:
+                self.output_ids.append(order[lo])
+                lo += 1
+            self.output_start.append(len(self.output_ids))
+
+            while lo < hi:
+                code: int = symbol_code(patterns[order[lo]][depth])
+                group_end: int = lo + 1
+                while group_end < hi and symbol_code(patterns[order[group_end]][depth]) == code:
+                    group_end += 1
+
+                child: int = self.size
+                self.edge_symbols.append(code)
+                self.edge_targets.append(child)
+                fail: int = self.next_state(self.fail[node], code) if node != 0 else 0
+                self.fail.append(fail)
+                self.terminal.append(fail if self.accepting[fail] else self.terminal[fail])
+                self.accepting.append(1 if len(patterns[order[lo]]) == depth + 1 else 0)
+                queue.append((lo, group_end, depth + 1))
+                lo = group_end
+
+            self.edge_start.append(len(self.edge_symbols))
+            node += 1
+
+    def goto(self, state: int, code: int) -> int:
+        lo: int = self.edge_start[state]
+        hi: int = self.edge_start[state + 1]
+        k: int = bisect_left(self.edge_symbols, code, lo, hi)
+        if k < hi and self.edge_symbols[k] == code:
+            return self.edge_targets[k]
+        return -1
+
+    def next_state(self, state: int, code: int) -> int:
+        while True:
+            target: int = self.goto(state, code)
+            if target != -1:
+                return target
+            if state == 0:
+                return 0
+            state = self.fail[state]
+
+    def outputs(self, state: int) -> array:
+        return self.output_ids[self.output_start[state]:self.output_start[state + 1]]
+
+    def iter_outputs(self, state: int) -> Iterator[int]:
+        while state > 0:
+            yield from self.output_ids[self.output_start[state]:self.output_start[state + 1]]
+            state = self.terminal[state] if self.terminal[state] != -1 else 0
+
+
+
+class CompiledAutomaton:
+    def __init__(self, automaton: CompactAutomaton) -> None:
+        self.patterns: Sequence[Pattern] = automaton.patterns
+        self.pattern_lengths: array = automaton.pattern_lengths
+        codes: List[int] = sorted(set(automaton.edge_symbols))
+        self.byte_mode: bool = not codes or codes[-1] < BYTE_ALPHABET_SIZE
+        if self.byte_mode:
+            self.columns: int = codes[-1] + 1 if codes else 1
+            self.symbol_column: Dict[int, int] = {code: code for code in codes}
+        else:
+            self.columns = len(codes) + 1
+            self.symbol_column = {code: column for column, code in enumerate(codes, 1)}
+        self.table: array = array('I')
+        self.output_start: array = array('I', [0])
+        self.output_ids: array = array('I')
+        self._compile(automaton)
+
+    @property
+    def size(self) -> int:
+        return len(self.output_start) - 1
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in (self.table, self.output_start, self.output_ids))
+
+    def _compile(self, automaton: CompactAutomaton) -> None:
+        width: int = self.columns
+        zero_row: array = array('I', bytes(4 * width))
+        for state in range(automaton.size):
+            if state == 0:
+                self.table.extend(zero_row)
+            else:
+                fail_row: int = automaton.fail[state] * width
+                self.table.extend(self.table[fail_row:fail_row + width])
+            row: int = state * width
+            for k in range(automaton.edge_start[state], automaton.edge_start[state + 1]):
+                self.table[row + self.symbol_column[automaton.edge_symbols[k]]] = automaton.edge_targets[k]
+            self.output_ids.extend(automaton.iter_outputs(state))
+            self.output_start.append(len(self.output_ids))
+
+    def column(self, code: int) -> int:
+        if self.byte_mode:
+            return code if code < self.columns else -1
+        return self.symbol_column.get(code, 0)
+
+    def next_state(self, state: int, code: int) -> int:
+        column: int = self.column(code)
+        return self.table[state * self.columns + column] if column >= 0 else 0
+
+    def outputs(self, state: int) -> array:
+        return self.output_ids[self.output_start[state]:self.output_start[state + 1]]
+
+    def iter_outputs(self, state: int) -> Iterator[int]:
+        yield from self.output_ids[self.output_start[state]:self.output_start[state + 1]]
+
+
+
+class ByteAutomaton:
+    def __init__(self, patterns: Sequence[Pattern]) -> None:
+        self.patterns: List[Pattern] = list(patterns)
+        encoded: List[bytes] = [encode_symbols(pattern) for pattern in self.patterns]
+        self.translation: bytes = byte_classes(encoded)
+        self.dfa: CompiledAutomaton = CompiledAutomaton(CompactAutomaton([p.translate(self.translation) for p in encoded]))
+
+    @property
+    def columns(self) -> int:
+        return self.dfa.columns
+
+    def encode(self, text: Union[str, bytes]) -> bytes:
+        return encode_symbols(text).translate(self.translation)
+
+    def finditer(self, codes: bytes) -> Iterator[Tuple[int, int]]:
+        table: array = self.dfa.table
+        width: int = self.dfa.columns
+        output_start: array = self.dfa.output_start
+        output_ids: array = self.dfa.output_ids
+        lengths: array = self.dfa.pattern_lengths
+        state: int = 0
+        for pos, code in enumerate(codes):
+            state = table[state * width + code]
+            if output_start[state] != output_start[state + 1]:
+                for k in range(output_start[state], output_start[state + 1]):
+                    yield pos - lengths[output_ids[k]] + 1, output_ids[k]
+
+
+
+def encode_symbols(symbols: Union[str, bytes]) -> bytes:
+    return symbols.encode('utf-8') if isinstance(symbols, str) else bytes(symbols)
+
+
+
+def byte_classes(patterns: Sequence[bytes]) -> bytes:
+    translation: bytearray = bytearray(BYTE_ALPHABET_SIZE)
+    for code, value in enumerate(sorted(set().union(*patterns)), 1):
+        translation[value] = code
+    return bytes(translation)
+
+
+
+def compile_automaton(patterns: Sequence[Pattern]) -> CompiledAutomaton:
+    return CompiledAutomaton(CompactAutomaton(patterns))
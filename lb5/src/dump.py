@@ -0,0 +1,130 @@
+import argparse
+import json
+import sys
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, TextIO
+
+DEFAULT_MAX_NODES: int = 500
+DUMP_FORMATS = ('dot', 'json', 'png', 'svg', 'pdf')
+
+
+
+def select_nodes(nodes: List, start: int = 0, max_depth: Optional[int] = None,
+                 max_nodes: Optional[int] = DEFAULT_MAX_NODES, follow_fail: bool = False) -> List[int]:
+    depth: Dict[int, int] = {start: 0}
+    queue: Deque[int] = deque([start])
+    selected: List[int] = []
+    while queue and (max_nodes is None or len(selected) < max_nodes):
+        current_idx: int = queue.popleft()
+        selected.append(current_idx)
+        if max_depth is not None and depth[current_idx] >= max_depth:
+            continue
+        node = nodes[current_idx]
+        neighbours: List[int] = list(node.trans.values())
+        if follow_fail:
+            neighbours.append(node.fail)
+        for neighbour in neighbours:
+            if neighbour not in depth:
+                depth[neighbour] = depth[current_idx] + 1
+                queue.append(neighbour)
+    return selected
+
+
+
+def node_label(idx: int, node) -> str:
+    return '\n'.join([
+        f'Узел {idx}',
+        f'Переходы: {len(node.trans)}',
+        f'Fail: {node.fail}',
+        f'Выходы: {node.outputs}',
+        f'Terminal: {node.terminal}',
+    ])
+
+
+
+def iter_dot(nodes: List, selected: List[int]) -> Iterator[str]:
+    chosen = set(selected)
+    yield 'digraph {\n'
+    yield '\t// Aho-Corasick Automaton\n'
+    for idx in selected:
+        node = nodes[idx]
+        shape: str = 'box' if all(target in chosen for target in node.trans.values()) else 'box3d'
+        yield f'\t{idx} [label={json.dumps(node_label(idx, node), ensure_ascii=False)} shape={shape}]\n'
+        for c, target in node.trans.items():
+            if target in chosen:
+                yield f'\t{idx} -> {target} [label={json.dumps(str(c), ensure_ascii=False)} color=blue]\n'
+        if node.fail != idx and node.fail != 0 and node.fail in chosen:
+            yield f'\t{idx} -> {node.fail} [label=fail color=red style=dashed]\n'
+    yield '}\n'
+
+
+
+def iter_json(nodes: List, selected: List[int]) -> Iterator[str]:
+    for idx in selected:
+        node = nodes[idx]
+        record = {
+            'id': idx,
+            'trans': {str(c): target for c, target in node.trans.items()},
+            'fail': node.fail,
+            'terminal': node.terminal,
+            'outputs': node.outputs,
+        }
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+
+def write_dump(nodes: List, out: TextIO, fmt: str = 'dot', **limits) -> int:
+    selected: List[int] = select_nodes(nodes, **limits)
+    lines: Iterator[str] = iter_json(nodes, selected) if fmt == 'json' else iter_dot(nodes, selected)
+    for line in lines:
+        out.write(line)
+    return len(selected)
+
+
+
+def render_automaton(nodes: List, filename: str = 'automaton', fmt: str = 'png', view: bool = False, **limits) -> str:
+    import graphviz
+
+    selected: List[int] = select_nodes(nodes, **limits)
+    source = graphviz.Source(''.join(iter_dot(nodes, selected)), filename=filename, format=fmt)
+    return source.render(view=view)
+
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Выгрузка автомата Ахо-Корасик')
+    parser.add_argument('patterns', help='файл с шаблонами, по одному в строке')
+    parser.add_argument('--format', choices=DUMP_FORMATS, default='dot')
+    parser.add_argument('--output', default='-', help="файл результата, '-' для stdout")
+    parser.add_argument('--state', type=int, default=0, help='узел, с которого начинается обход')
+    parser.add_argument('--depth', type=int, default=None)
+    parser.add_argument('--max-nodes', type=int, default=DEFAULT_MAX_NODES)
+    parser.add_argument('--follow-fail', action='store_true')
+    return parser.parse_args(argv)
+
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import aho1_debug
+
+    args = parse_args(argv)
+    aho1_debug.DEBUG = False
+    with open(args.patterns, encoding='utf-8') as source:
+        patterns: List[str] = [line.rstrip('\n') for line in source if line.rstrip('\n')]
+    nodes = aho1_debug.build_automaton(patterns)
+    limits = dict(start=args.state, max_depth=args.depth, max_nodes=args.max_nodes, follow_fail=args.follow_fail)
+
+    if args.format in ('dot', 'json'):
+        if args.output == '-':
+            write_dump(nodes, sys.stdout, args.format, **limits)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as out:
+                write_dump(nodes, out, args.format, **limits)
+    else:
+        output: str = 'automaton' if args.output == '-' else args.output
+        print(render_automaton(nodes, output, args.format, **limits))
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import heapq
+import threading
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from aho1_debug import AhoNode, StreamScanner, build_automaton, debug_print
+
+OVERLAY_LIMIT: int = 1024
+REMOVED_RATIO: float = 0.5
+
+
+
+class Layer(NamedTuple):
+    nodes: List[AhoNode]
+    patterns: List[str]
+    ids: List[int]
+
+
+
+class Snapshot(NamedTuple):
+    base: Layer
+    overlay: Layer
+    removed: FrozenSet[int]
+
+    def search(self, text: str) -> List[Tuple[int, int]]:
+        # Номера шаблонов внутри слоя растут вместе с их id, поэтому результаты слоёв уже упорядочены
+        found: List[List[Tuple[int, int]]] = []
+        for layer in (self.base, self.overlay):
+            if layer.patterns:
+                scanner = StreamScanner(layer.nodes, layer.patterns)
+                found.append([(pos, layer.ids[p_num - 1]) for pos, p_num in scanner.feed(text) + scanner.close()
+                              if layer.ids[p_num - 1] not in self.removed])
+        return list(heapq.merge(*found))
+
+
+
+def build_layer(entries: List[Tuple[int, str]]) -> Layer:
+    patterns: List[str] = [pattern for _, pattern in entries]
+    return Layer(build_automaton(patterns), patterns, [pattern_id for pattern_id, _ in entries])
+
+
+
+class DynamicAutomaton:
+    def __init__(self, patterns: Optional[List[str]] = None, overlay_limit: int = OVERLAY_LIMIT) -> None:
+        self.overlay_limit: int = overlay_limit
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._next_id: int = 1
+        self._base: List[Tuple[int, str]] = []
+        self._overlay: List[Tuple[int, str]] = []
+        self._removed: FrozenSet[int] = frozenset()
+        for pattern in patterns or []:
+            if pattern not in self._ids:
+                self._ids[pattern] = self._next_id
+                self._base.append((self._next_id, pattern))
+                self._next_id += 1
+        self._snapshot: Snapshot = Snapshot(build_layer(self._base), build_layer([]), self._removed)
+
+    @property
+    def snapshot(self) -> Snapshot:
+        return self._snapshot
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, pattern: str) -> bool:
+        return pattern in self._ids
+
+    def add_pattern(self, pattern: str) -> int:
+        with self._lock:
+            if pattern in self._ids:
+                return self._ids[pattern]
+            pattern_id: int = self._next_id
+            self._next_id += 1
+            self._ids[pattern] = pattern_id
+            self._overlay = self._overlay + [(pattern_id, pattern)]
+            debug_print(f"Добавлен шаблон {pattern_id}: '{pattern}' (оверлей: {len(self._overlay)})")
+            if len(self._overlay) > self.overlay_limit:
+                self._compact()
+            else:
+                self._publish(overlay=build_layer(self._overlay))
+            return pattern_id
+
+    def remove_pattern(self, pattern: str) -> bool:
+        with self._lock:
+            pattern_id: Optional[int] = self._ids.pop(pattern, None)
+            if pattern_id is None:
+                return False
+            debug_print(f"Удалён шаблон {pattern_id}: '{pattern}'")
+            overlay: List[Tuple[int, str]] = [entry for entry in self._overlay if entry[0] != pattern_id]
+            if len(overlay) != len(self._overlay):
+                self._overlay = overlay
+                self._publish(overlay=build_layer(overlay))
+            else:
+                self._removed = self._removed | {pattern_id}
+                if len(self._removed) > REMOVED_RATIO * len(self._base):
+                    self._compact()
+                else:
+                    self._publish()
+            return True
+
+    def compact(self) -> None:
+        with self._lock:
+            self._compact()
+
+    def search(self, text: str) -> List[Tuple[int, int]]:
+        return self._snapshot.search(text)
+
+    def _compact(self) -> None:
+        self._base = [entry for entry in self._base if entry[0] not in self._removed] + self._overlay
+        self._overlay = []
+        self._removed = frozenset()
+        debug_print(f"Слияние оверлея: базовый автомат пересобран из {len(self._base)} шаблонов")
+        self._snapshot = Snapshot(build_layer(self._base), build_layer([]), self._removed)
+
+    def _publish(self, overlay: Optional[Layer] = None) -> None:
+        # Старый снимок не изменяется: идущие поиски дочитывают его до конца
+        self._snapshot = Snapshot(self._snapshot.base, overlay or self._snapshot.overlay, self._removed)